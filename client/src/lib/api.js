@@ -49,13 +49,27 @@ export async function generateReport(findings = [], clientName = "Unknown Client
     return await response.json();
 }
 
-export async function fetchReports() {
+// Last response per report-list URL, revalidated with its ETag
+const reportPages = new Map();
+
+export async function fetchReports(cursor = null, limit = 50) {
+    // One page, newest first; pass next_cursor back to load the next one
+    const params = new URLSearchParams({ limit });
+    if (cursor !== null) params.set('cursor', cursor);
+    const url = `${API_BASE}/api/reports?${params}`;
+    const cached = reportPages.get(url);
     try {
-        const response = await fetch(`${API_BASE}/api/reports`);
-        return await response.json();
+        const response = await fetch(url, {
+            headers: cached ? { 'If-None-Match': cached.etag } : {}
+        });
+        if (response.status === 304 && cached) return cached.page;
+        const page = await response.json();
+        const etag = response.headers.get('ETag');
+        if (etag) reportPages.set(url, { etag, page });
+        return page;
     } catch (error) {
         console.error("Failed to fetch reports", error);
-        return { reports: [], count: 0 };
+        return { reports: [], count: 0, next_cursor: null };
     }
 }
 
@@ -11,6 +11,9 @@ export default function Reports() {
     const [loading, setLoading] = useState(true);
     const [generating, setGenerating] = useState(false);
     const [deleting, setDeleting] = useState(null);
+    const [total, setTotal] = useState(0);
+    const [nextCursor, setNextCursor] = useState(null);
+    const [loadingMore, setLoadingMore] = useState(false);
 
     useEffect(() => {
         loadReports();
@@ -20,9 +23,20 @@ export default function Reports() {
         setLoading(true);
         const data = await fetchReports();
         setReports(data.reports || []);
+        setTotal(data.count || 0);
+        setNextCursor(data.next_cursor ?? null);
         setLoading(false);
     };
 
+    const loadMoreReports = async () => {
+        setLoadingMore(true);
+        const data = await fetchReports(nextCursor);
+        setReports(prev => [...prev, ...(data.reports || [])]);
+        setTotal(data.count || 0);
+        setNextCursor(data.next_cursor ?? null);
+        setLoadingMore(false);
+    };
+
     const handleGenerateReport = async () => {
         setGenerating(true);
         try {
@@ -72,6 +86,7 @@ export default function Reports() {
             });
             if (response.ok) {
                 setReports(prev => prev.filter(r => r.filename !== filename));
+                setTotal(prev => Math.max(prev - 1, 0));
             } else {
                 console.error('Failed to delete report');
             }
@@ -121,7 +136,7 @@ export default function Reports() {
             <Card>
                 <CardHeader>
                     <CardTitle className="flex items-center gap-2">
-                        <FileText className="h-5 w-5" /> Available Reports ({reports.length})
+                        <FileText className="h-5 w-5" /> Available Reports ({total})
                     </CardTitle>
                 </CardHeader>
                 <CardContent>
@@ -174,6 +189,13 @@ export default function Reports() {
                                     </div>
                                 </div>
                             ))}
+                            {nextCursor !== null && (
+                                <div className="flex justify-center pt-2">
+                                    <Button variant="outline" onClick={loadMoreReports} disabled={loadingMore}>
+                                        {loadingMore ? 'Loading...' : `Load more (${reports.length} of ${total})`}
+                                    </Button>
+                                </div>
+                            )}
                         </div>
                     )}
                 </CardContent>
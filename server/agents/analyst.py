@@ -1,61 +1,187 @@
 from agents.base import Agent
 from services.llm import LLMService
 from services.rag_service import RAGService
-from tools.scorer import RiskScorer
-from typing import Dict, Any
+from services.metrics import ComplianceMetrics
+from tools.scorer import RiskScorer, RANK
+from tools.chunker import DocumentChunker
+from tools.context_packer import ContextPacker, truncate_tokens
+from typing import Dict, Any, List, Tuple
+import asyncio
+import os
+import re
+
+# Section results that report no gap; dropped from the merged finding when other sections found one
+NO_GAP_MARKERS = ("no immediate compliance issues", "no compliance gaps", "no gaps detected", "fully compliant")
+# Regulation citations such as "Art. 30", "Article 5(1)(e)", "Section 3.2", "Requirement 8.3.1"
+REGULATION_REF = re.compile(r"\b(art|sec|req)[a-z]*\.?\s*(\d+(?:\.\d+)*(?:\(\w+\))*)", re.IGNORECASE)
+FIRST_SENTENCE = re.compile(r"^(.+?[.!?])(?=\s+[A-Z]|\s*$)", re.DOTALL)
+
+
+def _finding_keys(finding: str) -> set:
+    """Dedup keys of a finding: its normalized first sentence and, if any, the set of provisions it cites."""
+    match = FIRST_SENTENCE.match(finding)
+    first = match.group(1) if match else finding
+    keys = {("sentence", re.sub(r"[^a-z0-9]+", " ", first.lower()).strip())}
+    refs = frozenset(f"{kind.lower()} {number.lower()}" for kind, number in REGULATION_REF.findall(finding))
+    if refs:
+        keys.add(("refs", refs))
+    return keys
+
 
 class GapAnalyst(Agent):
     """
     Expert at comparing internal Policy vs. External Regulation to find gaps.
     Can automatically remediate findings when enabled.
     """
-    def __init__(self, llm: LLMService, rag: RAGService):
+    def __init__(self, llm: LLMService, rag: RAGService, store=None):
         tools = [RiskScorer()]
         super().__init__(name="Analyst", role="Compliance Analysis", tools=tools)
         self.llm = llm
         self.rag = rag
         self.auto_remediation_enabled = False  # Controlled by settings
+        self.metrics = ComplianceMetrics()  # Dashboard counters, fed by act()
+        self.store = store  # Optional FindingsStore for persistence
+        # Long policies are analyzed section by section (map) and the findings merged (reduce)
+        self.sectioner = DocumentChunker(chunk_size=int(os.getenv("ANALYST_SECTION_CHARS", "2000")), chunk_overlap=0)
+        self.section_concurrency = int(os.getenv("ANALYST_SECTION_CONCURRENCY", "8"))
+        # Retrieve a wider pool than fits, then pack the best chunks under the token budget
+        self.retrieve_k = int(os.getenv("ANALYST_RETRIEVE_K", "6"))
+        self.policy_tokens = int(os.getenv("ANALYST_POLICY_TOKENS", "1000"))
+        self.packer = ContextPacker()
+
+    def retrieve(self, text: str):
+        return self.rag.query(text, self.retrieve_k)
 
-    async def analyze_policy(self, policy_text: str):
+    async def analyze_policy(self, policy_text: str, retrieve=None, record=None):
+        """
+        retrieve is an optional async callable (text) -> regulations used instead of a
+        direct RAG query, e.g. to share lookups across a batch.
+        record is an optional callable (finding row) used instead of writing the finding
+        to the store, e.g. to collect a batch's findings into one bulk write.
+        """
         self.log_activity("Received policy for analysis.")
-        
-        # 1. Retrieve relevant regulations from RAG
-        context_docs = await self.rag.query(policy_text)
-        
-        # 2. Think: Detect Gaps using LLM
-        finding = await self.think({"policy": policy_text, "regulations": context_docs})
+        retrieve = retrieve or self.retrieve
+        sections = self.sectioner.chunk(policy_text) or [{"index": 0, "text": policy_text}]
+        if len(sections) > 1:
+            self.log_activity(f"Split policy into {len(sections)} sections for analysis.")
+        limit = asyncio.Semaphore(self.section_concurrency)
+
+        async def check(section):
+            async with limit:
+                # 1. Retrieve the regulations relevant to this section from RAG
+                context_docs = await retrieve(section["text"])
+                prompt, usage = self.build_prompt({"policy": section["text"], "regulations": context_docs})
+                self.log_activity(
+                    f"Cross-referencing policy section {section['index'] + 1} against {usage['chunks']} "
+                    f"regulation chunks ({usage['prompt_tokens']} prompt tokens)..."
+                )
+                # 2. Think: Detect Gaps using LLM
+                return await self.llm.complete(prompt, agent=self.name), usage
+
+        tasks = [asyncio.ensure_future(check(section)) for section in sections]
+        try:
+            checked = await asyncio.gather(*tasks)
+        except BaseException:
+            # One failed section fails the analysis; stop the others from spending LLM calls
+            for task in tasks:
+                task.cancel()
+            raise
+        findings = [f for f, _ in checked]
+        finding = self.merge_findings(sections, findings)
+        risk_matrix = self.score_sections(sections, findings) if len(sections) > 1 else None
         
         # 3. Act: Report Finding and optionally Auto-Remediate
-        result = await self.act(finding)
+        result = await self.act(finding, risk_matrix, record)
+        result["prompt_usage"] = {
+            "prompts": len(checked),
+            "prompt_tokens": sum(u["prompt_tokens"] for _, u in checked),
+            "context_tokens": sum(u["context_tokens"] for _, u in checked)
+        }
         return result
 
-    async def think(self, context: Dict[str, Any]) -> str:
-        policy = context.get("policy", "")
+    @staticmethod
+    def reduce_findings(sections: List[Dict[str, Any]], findings: List[str]) -> List[Tuple[str, str]]:
+        """
+        Per-section findings that report a gap, as (section label, finding), with
+        repeats dropped: two findings are the same gap if they cite the same
+        regulation references or open with the same sentence.
+        """
+        kept, seen = [], set()
+        for section, finding in zip(sections, findings):
+            text = finding.strip()
+            if not text or any(marker in " ".join(text.lower().split()) for marker in NO_GAP_MARKERS):
+                continue
+            keys = _finding_keys(text)
+            if keys & seen:
+                continue
+            seen |= keys
+            heading = section["text"].strip().split("\n", 1)[0][:60]
+            kept.append((f"Section {section['index'] + 1}: {heading}", text))
+        return kept
+
+    @classmethod
+    def merge_findings(cls, sections: List[Dict[str, Any]], findings: List[str]) -> str:
+        """Reduce per-section findings to one text; "no gap" results only if no section found a gap."""
+        if len(findings) == 1:
+            return findings[0]
+        gaps = cls.reduce_findings(sections, findings)
+        if not gaps:
+            return findings[0]
+        if len(gaps) == 1:
+            return gaps[0][1]
+        return "\n\n".join(f"[{label}] {finding}" for label, finding in gaps)
+
+    def score_sections(self, sections: List[Dict[str, Any]], findings: List[str]) -> Dict[str, str]:
+        """
+        Score each distinct section finding on its own and return the most severe risk
+        matrix, so one section mentioning e.g. PII is not applied to the whole merged text.
+        """
+        scorer = self.use_tool("RiskScorer")
+        gaps = self.reduce_findings(sections, findings) or [("", findings[0])]
+        matrices = [scorer.calculate_score(finding) for _, finding in gaps]
+        return max(matrices, key=lambda m: (RANK[m["severity"]], RANK[m["impact"]], RANK[m["likelihood"]]))
+
+    def build_prompt(self, context: Dict[str, Any]):
+        """Gap-analysis prompt with regulations packed under the token budget; returns (prompt, usage)."""
+        policy = truncate_tokens(context.get("policy", ""), self.policy_tokens)
         regs = context.get("regulations", [])
         
-        self.log_activity(f"Cross-referencing policy against {len(regs)} regulations...")
-        
-        # Format regulations for prompt
-        reg_text = "\n".join([str(r.get('content', r)) for r in regs[:3]]) if regs else "No regulations indexed yet."
+        # Pack the highest-ranked regulation chunks, skipping repeats and overlaps
+        packed = self.packer.pack(regs) if regs else None
+        reg_text = packed["text"] if packed else "No regulations indexed yet."
         
         prompt = f"""Analyze the following corporate policy for compliance gaps against regulations.
 
 POLICY:
-{policy[:500]}
+{policy}
 
 REGULATIONS:
-{reg_text[:500]}
+{reg_text}
 
 Identify any compliance gaps, missing requirements, or violations. Be specific about what is missing or incorrect."""
 
-        return await self.llm.complete(prompt)
+        usage = {
+            "prompt_tokens": self.packer.record_prompt(prompt),
+            "context_tokens": packed["tokens"] if packed else 0,
+            "chunks": packed["chunks"] if packed else 0
+        }
+        return prompt, usage
 
-    async def act(self, finding: str) -> Dict[str, Any]:
+    async def think(self, context: Dict[str, Any]) -> str:
+        prompt, _ = self.build_prompt(context)
+        return await self.llm.complete(prompt, agent=self.name)
+
+    async def act(self, finding: str, risk_matrix: Dict[str, str] = None, record=None) -> Dict[str, Any]:
+        """
+        risk_matrix, if given, was already scored (per section); otherwise the finding is scored.
+        record, if given, receives the finding row instead of the store.
+        """
         self.log_activity(f"Gap Detection Complete. Finding: {finding[:100]}...")
         
         # USE TOOL: Risk Scorer
-        scorer = self.use_tool("RiskScorer")
-        risk_matrix = scorer.calculate_score(finding)
+        if risk_matrix is None:
+            scorer = self.use_tool("RiskScorer")
+            risk_matrix = scorer.calculate_score(finding)
         self.log_activity(f"Risk Scored: {risk_matrix['severity']} (Impact: {risk_matrix['impact']})")
 
         # AUTO-REMEDIATION LOGIC - Only if enabled in settings
@@ -71,8 +197,9 @@ Identify any compliance gaps, missing requirements, or violations. Be specific a
 FINDING: {finding}
 
 Provide a concrete policy update or fix that would address this gap. Be specific and actionable."""
+            self.packer.record_prompt(remediation_prompt)
 
-            remediation_action = await self.llm.complete(remediation_prompt)
+            remediation_action = await self.llm.complete(remediation_prompt, agent=self.name)
             self.log_activity(f"Generated Fix: {remediation_action[:100]}...")
             remediation_status = "Remediated"
             self.log_activity("Remediation Successful. Status updated to REMEDIATED.")
@@ -80,6 +207,20 @@ Provide a concrete policy update or fix that would address this gap. Be specific
             self.log_activity("Auto-Remediation DISABLED. Finding requires manual review.")
             remediation_status = "Pending Manual Review"
 
+        self.metrics.record_finding(risk_matrix['severity'], remediation_status)
+        row = {
+            "client": self.current_client,
+            "severity": risk_matrix['severity'],
+            "status": remediation_status,
+            "impact": risk_matrix['impact'],
+            "likelihood": risk_matrix['likelihood'],
+            "finding": finding,
+            "action_taken": remediation_action
+        }
+        if record is not None:
+            record(row)
+        elif self.store is not None:
+            await asyncio.to_thread(self.store.add_findings, [row])
         return {
             "finding": finding, 
             "risk_matrix": risk_matrix,
@@ -1,33 +1,104 @@
+import os
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List
+from collections import deque
+from itertools import count, islice, takewhile
+from typing import Dict, Any, List, Iterator, Optional
 from datetime import datetime
+from contextvars import ContextVar
+
+# Shared across agents so one cursor orders every agent's activity
+_activity_seq = count(1)
 
 
 class ActivityLogEntry:
     """Structured activity log entry with timestamp and context."""
+    __slots__ = ("seq", "timestamp", "action", "agent_name", "agent_role", "client", "_dict")
+
     def __init__(self, action: str, agent_name: str, agent_role: str, client: str = None):
+        self.seq = next(_activity_seq)
         self.timestamp = datetime.now()
         self.action = action
         self.agent_name = agent_name
         self.agent_role = agent_role
         self.client = client
+        self._dict = None
     
     def to_dict(self) -> Dict[str, Any]:
-        return {
-            "timestamp": self.timestamp.isoformat(),
-            "time_display": self.timestamp.strftime("%H:%M:%S"),
-            "date_display": self.timestamp.strftime("%Y-%m-%d"),
-            "action": self.action,
-            "agent": self.agent_name,
-            "role": self.agent_role,
-            "client": self.client
-        }
+        # Entries never change, so the formatted dict is built once
+        if self._dict is None:
+            self._dict = {
+                "seq": self.seq,
+                "timestamp": self.timestamp.isoformat(),
+                "time_display": self.timestamp.strftime("%H:%M:%S"),
+                "date_display": self.timestamp.strftime("%Y-%m-%d"),
+                "action": self.action,
+                "agent": self.agent_name,
+                "role": self.agent_role,
+                "client": self.client
+            }
+        return dict(self._dict)
     
     def __str__(self) -> str:
         client_str = f" [{self.client}]" if self.client else ""
         return f"[{self.timestamp.strftime('%H:%M:%S')}] [{self.agent_role}]{client_str} {self.action}"
 
 
+class ActivityLog:
+    """
+    Fixed-capacity ring buffer of ActivityLogEntry; the oldest entries are overwritten first.
+    A per-client index lets client-filtered reads walk only that client's entries.
+    """
+    __slots__ = ("capacity", "_slots", "_start", "_count", "_by_client")
+
+    def __init__(self, capacity: int = 1000):
+        self.capacity = max(1, capacity)
+        self._slots: List[Optional[ActivityLogEntry]] = [None] * self.capacity
+        self._start = 0  # slot of the oldest entry
+        self._count = 0
+        self._by_client: Dict[str, deque] = {}
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[ActivityLogEntry]:
+        for i in range(self._count):
+            yield self._slots[(self._start + i) % self.capacity]
+
+    def append(self, entry: ActivityLogEntry):
+        if self._count == self.capacity:
+            evicted = self._slots[self._start]
+            self._slots[self._start] = entry
+            self._start = (self._start + 1) % self.capacity
+            # The evicted entry is the oldest of its client too
+            if evicted.client:
+                entries = self._by_client[evicted.client]
+                entries.popleft()
+                if not entries:
+                    del self._by_client[evicted.client]
+        else:
+            self._slots[(self._start + self._count) % self.capacity] = entry
+            self._count += 1
+        if entry.client:
+            self._by_client.setdefault(entry.client, deque()).append(entry)
+
+    def _newest_first(self, client: str = None) -> Iterator[ActivityLogEntry]:
+        if client is not None:
+            return reversed(self._by_client.get(client, ()))
+        return (self._slots[(self._start + i) % self.capacity] for i in range(self._count - 1, -1, -1))
+
+    def latest(self, limit: int = None, client: str = None) -> List[ActivityLogEntry]:
+        """The newest limit entries (all if None), oldest first."""
+        entries = list(islice(self._newest_first(client), limit))
+        entries.reverse()
+        return entries
+
+    def since(self, cursor: int, limit: int = None, client: str = None) -> List[ActivityLogEntry]:
+        """Entries with seq > cursor, oldest first; with limit, the first limit of them."""
+        entries = list(takewhile(lambda entry: entry.seq > cursor, self._newest_first(client)))
+        entries.reverse()
+        return entries[:limit] if limit else entries
+
+
 class Agent(ABC):
     """
     Abstract Base Class for all Autonomous Agents.
@@ -37,12 +108,17 @@ class Agent(ABC):
         self.name = name
         self.role = role
         self.tools = tools or []
-        self.activity_log: List[ActivityLogEntry] = []
-        self.current_client: str = None  # Track which client/document is being processed
+        self.activity_log = ActivityLog(int(os.getenv("ACTIVITY_LOG_CAPACITY", "1000")))
+        # Track which client/document is being processed; per asyncio task so concurrent work stays separate
+        self._current_client: ContextVar = ContextVar(f"{name}_current_client", default=None)
+
+    @property
+    def current_client(self) -> str:
+        return self._current_client.get()
 
     def set_current_client(self, client_name: str):
         """Set the current client/document being processed."""
-        self.current_client = client_name
+        self._current_client.set(client_name)
 
     def log_activity(self, action: str, client: str = None):
         """Logs an action with timestamp and client context."""
@@ -51,15 +127,20 @@ class Agent(ABC):
         print(f"[{self.name.upper()}] {entry}")
         self.activity_log.append(entry)
 
-    def get_activity_log(self, limit: int = None) -> List[Dict[str, Any]]:
-        """Get activity log as list of dictionaries for API response."""
-        logs = self.activity_log[-limit:] if limit else self.activity_log
+    def get_activity_log(self, limit: int = None, since: int = None, client: str = None) -> List[Dict[str, Any]]:
+        """
+        Get activity log as list of dictionaries for API response.
+        With since, only entries newer than that cursor (a previous entry's seq) are returned.
+        """
+        if since is not None:
+            logs = self.activity_log.since(since, limit, client)
+        else:
+            logs = self.activity_log.latest(limit, client)
         return [entry.to_dict() for entry in logs]
 
     def get_activity_log_strings(self, limit: int = None) -> List[str]:
         """Get activity log as formatted strings for backward compatibility."""
-        logs = self.activity_log[-limit:] if limit else self.activity_log
-        return [str(entry) for entry in logs]
+        return [str(entry) for entry in self.activity_log.latest(limit)]
 
     def use_tool(self, tool_name: str, **kwargs):
         """
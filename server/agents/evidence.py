@@ -1,6 +1,7 @@
 from agents.base import Agent
 from tools.pdf_gen import PDFGenerator
 from typing import Dict, Any
+import asyncio
 
 class EvidenceOfficer(Agent):
     """
@@ -10,11 +11,16 @@ class EvidenceOfficer(Agent):
         tools = [PDFGenerator()]
         super().__init__(name="Officer", role="Audit & Reporting", tools=tools)
 
-    async def generate_package(self, findings: list, client_name: str = "Unknown Client", compliance_score: int = None):
+    async def generate_package(self, findings: list, client_name: str = "Unknown Client", compliance_score: int = None,
+                               render=None):
+        """
+        render is an optional async callable (findings, client_name, compliance_score) -> filename,
+        e.g. a process-pool renderer; by default the PDF is rendered on a worker thread.
+        """
         self.set_current_client(client_name)
         self.log_activity(f"Compiling evidence package for {client_name}...")
         report_data = await self.think({"findings": findings, "client": client_name, "score": compliance_score})
-        return await self.act(report_data, findings, client_name, compliance_score)
+        return await self.act(report_data, findings, client_name, compliance_score, render)
 
     async def think(self, context: Dict[str, Any]) -> str:
         count = len(context.get("findings", []))
@@ -23,12 +29,18 @@ class EvidenceOfficer(Agent):
         status = "COMPLIANT" if count == 0 and score >= 90 else "GAPS DETECTED"
         return f"Audit Report for {client}. Score: {score}%. Findings: {count}. Status: {status}."
 
-    async def act(self, plan: str, findings: list = None, client_name: str = "Unknown", compliance_score: int = None) -> Dict[str, Any]:
+    async def act(self, plan: str, findings: list = None, client_name: str = "Unknown", compliance_score: int = None,
+                  render=None) -> Dict[str, Any]:
         self.log_activity(f"Finalizing PDF Report for {client_name} (Score: {compliance_score}%)...")
         
-        # USE TOOL: PDF Generator
-        gen = self.use_tool("PDFGenerator")
-        filename = gen.generate_report(findings or [], client_name, compliance_score=compliance_score)
+        if render is not None:
+            filename = await render(findings or [], client_name, compliance_score)
+        else:
+            # USE TOOL: PDF Generator
+            gen = self.use_tool("PDFGenerator")
+            filename = await asyncio.to_thread(
+                gen.generate_report, findings or [], client_name, compliance_score=compliance_score
+            )
         
         self.log_activity(f"Report saved: {filename}")
         
@@ -3,7 +3,9 @@ from services.llm import LLMService
 from services.rag_service import RAGService
 from tools.search import RegulatorySearch
 from tools.extractor import ObligationExtractor
-from typing import Dict, Any
+from tools.context_packer import ContextPacker
+from typing import Dict, Any, List
+import os
 
 class RegulatoryScout(Agent):
     """
@@ -15,6 +17,7 @@ class RegulatoryScout(Agent):
         super().__init__(name="Scout", role="Regulatory Discovery", tools=tools)
         self.llm = llm
         self.rag = rag
+        self.packer = ContextPacker(int(os.getenv("SCOUT_OBLIGATION_TOKENS", "2000")))
 
     async def scan_feed(self, source_url: str):
         self.log_activity(f"Scanning regulatory feed: {source_url}")
@@ -26,28 +29,54 @@ class RegulatoryScout(Agent):
         for update in updates:
             await self.process_regulation(update['summary'], update['title'])
 
-    async def process_regulation(self, text: str, title: str):
+    async def process_regulation(self, text: str, title: str, doc_id: str = None):
+        # Content-addressed: unchanged documents skip extraction, LLM and embedding
+        doc_id = doc_id or self.rag.content_id(text)
+        if self.rag.is_indexed(doc_id):
+            self.log_activity(f"Skipping unchanged regulation: {title}")
+            return {"status": "unchanged", "doc_id": doc_id}
+
+        obligations = self.extract_obligations(text, title)
+        
+        # 1. Think: Interpret the text
+        analysis = await self.think({"text": text, "obligations": obligations})
+        
+        # 2. Act: Index into RAG
+        result = await self.act(analysis + f" | RAW: {text}", doc_id, title)
+        return result
+
+    def extract_obligations(self, text: str, title: str) -> List[str]:
         self.log_activity(f"Reading regulation: {title}")
         
         # USE TOOL: Obligation Extractor
         extractor_tool = self.use_tool("ObligationExtractor")
         obligations = extractor_tool.extract(text)
         self.log_activity(f"Extracted {len(obligations)} obligations.")
+        return obligations
+
+    def open_obligation_stream(self, title: str):
+        """Incremental counterpart of extract_obligations for page-by-page ingest."""
+        self.log_activity(f"Reading regulation: {title}")
         
-        # 1. Think: Interpret the text
-        analysis = await self.think({"text": text, "obligations": obligations})
-        
-        # 2. Act: Index into RAG
-        result = await self.act(analysis + f" | RAW: {text}")
-        return result
+        # USE TOOL: Obligation Extractor
+        extractor_tool = self.use_tool("ObligationExtractor")
+        return extractor_tool.stream()
 
     async def think(self, context: Dict[str, Any]) -> str:
         text = context.get("text", "")
         obligations = context.get("obligations", [])
-        self.log_activity(f"Interpreting {len(obligations)} derived obligations...")
-        return await self.llm.complete(f"Summarize obligations: {obligations}")
+        # Obligations come in document order; repeats are dropped and the list is cut at the budget
+        packed = self.packer.pack([f"- {o}" for o in obligations], separator="\n")
+        prompt = f"Summarize obligations:\n{packed['text']}"
+        tokens = self.packer.record_prompt(prompt)
+        self.log_activity(
+            f"Interpreting {packed['chunks']} of {len(obligations)} derived obligations ({tokens} prompt tokens)..."
+        )
+        # Regulation ingest is background work; interactive analysis goes first
+        return await self.llm.complete(prompt, priority="batch", agent=self.name)
 
-    async def act(self, plan: str) -> Dict[str, Any]:
+    async def act(self, plan: str, doc_id: str = None, title: str = None) -> Dict[str, Any]:
         self.log_activity("Indexing knowledge into Vector DB...")
-        await self.rag.add_document(plan, {"type": "regulation"})
-        return {"status": "indexed", "summary": plan}
+        metadata = {"type": "regulation", "title": title} if title else {"type": "regulation"}
+        await self.rag.add_document(plan, metadata, doc_id=doc_id)
+        return {"status": "indexed", "doc_id": doc_id, "summary": plan}
@@ -1,31 +1,54 @@
 from agents.base import Agent
 from tools.monitor import LogMonitor
 from tools.workflow import WorkflowAutomation
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple
+import asyncio
 import random
 
+# Alert severity by LogMonitor detector; anything else is High
+DETECTOR_SEVERITY = {"credit_card": "Critical", "iban": "Critical", "ssn": "Critical"}
+
+
 class RiskSentinel(Agent):
     """
     Real-time monitoring agent for data streams (Logs, Transactions).
     """
-    def __init__(self):
+    def __init__(self, store=None):
         tools = [LogMonitor(), WorkflowAutomation()]
         super().__init__(name="Sentinel", role="Risk Monitoring", tools=tools)
+        self.store = store  # Optional FindingsStore for persistence
 
     async def monitor_stream(self, data_stream: List[Dict]):
         self.log_activity(f"Monitoring {len(data_stream)} events...")
-        
+        return [risk for _, risk in await self.scan_batch(data_stream)]
+
+    async def scan_batch(self, events: List[Dict]) -> List[Tuple[Dict, Dict[str, Any]]]:
+        """Scan one batch of events; returns (event, risk) for each anomaly, in event order."""
         # USE TOOL: Log Monitor
         monitor = self.use_tool("LogMonitor")
-        anomalies = monitor.scan_for_anomalies(data_stream)
-        
+        anomalies = await asyncio.to_thread(monitor.scan_for_anomalies, events)
+
         risks = []
         for anomaly in anomalies:
             self.log_activity(f"Anomaly Detected: {anomaly.get('detected_pattern')}")
             # Workflow: If anomaly, trigger alert
             risk = await self.act(str(anomaly))
-            risks.append(risk)
-            
+            risks.append((anomaly, risk))
+
+        if self.store is not None and risks:
+            # One bulk insert per batch
+            await asyncio.to_thread(self.store.add_alerts, [
+                {
+                    "client": anomaly.get("client") or self.current_client,
+                    "severity": DETECTOR_SEVERITY.get(anomaly.get("detector"), "High"),
+                    "status": "Open",
+                    "detector": anomaly.get("detector"),
+                    "detected_pattern": anomaly.get("detected_pattern"),
+                    "event_id": None if anomaly.get("id") is None else str(anomaly.get("id")),
+                    "ticket": risk.get("ticket")
+                }
+                for anomaly, risk in risks
+            ])
         return risks
 
     async def think(self, context: Dict[str, Any]) -> str:
@@ -0,0 +1,107 @@
+"""
+Benchmark: ObligationExtractor throughput (MB/sec) against the previous split-based extractor,
+on regulation-sized text, for whole-document and page-by-page (streamed) extraction.
+Peak memory is measured separately with tracemalloc.
+
+Run from server/:  python -m benchmarks.bench_extractor [megabytes]
+"""
+import sys
+import time
+import random
+import contextlib
+import io
+import tracemalloc
+
+from tools.extractor import ObligationExtractor
+
+
+def legacy_extract(text):
+    """The pre-rewrite ObligationExtractor.match, kept for comparison."""
+    obligations = []
+    sentences = text.replace('!', '.').replace('?', '.').split('.')
+    for s in sentences:
+        s_lower = s.strip().lower()
+        if any(keyword in s_lower for keyword in ["must", "shall", "required", "mandatory"]):
+            print(f"   -> Found obligation: {s.strip()[:50]}...")
+            obligations.append(s.strip())
+    return obligations
+
+
+def make_regulation(megabytes: float, obligation_rate: float = 0.3, seed: int = 11) -> str:
+    """Articles of numbered paragraphs with section references and abbreviations."""
+    rng = random.Random(seed)
+    subjects = ["The controller", "Each processor", "The payment service provider", "Member States",
+                "The supervisory authority", "An obliged entity", "The operator of essential services"]
+    obligations = ["shall implement appropriate technical and organisational measures",
+                   "must notify the competent authority without undue delay",
+                   "is required to retain records for a period of five years",
+                   "shall ensure that cardholder data is encrypted at rest and in transit"]
+    statements = ["may designate a representative in the Union",
+                  "publishes guidelines on the application of this Regulation",
+                  "takes into account the state of the art and the costs of implementation",
+                  "cooperates with other authorities, e.g. on cross-border cases"]
+    references = ["Art. 5.1", "Sec. 3(b)", "Art. 32(1)(a)", "para. 4", "Annex II, No. 7", "Art. 17.2.c"]
+
+    target = int(megabytes * 1024 * 1024)
+    parts, size, article = [], 0, 1
+    while size < target:
+        heading = f"\n\nArticle {article}\nSubject matter and scope\n\n"
+        parts.append(heading)
+        size += len(heading)
+        for paragraph in range(1, rng.randint(3, 8)):
+            verb = rng.choice(obligations) if rng.random() < obligation_rate else rng.choice(statements)
+            sentence = (f"{paragraph}. {rng.choice(subjects)} {verb}, in accordance with "
+                        f"{rng.choice(references)} of Directive (EU) 2015/{rng.randint(100, 999)}. ")
+            parts.append(sentence)
+            size += len(sentence)
+        article += 1
+    return "".join(parts)
+
+
+def throughput(fn, text, repeat: int = 3):
+    """Best-of-repeat MB/sec and the number of obligations found."""
+    best = float("inf")
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            started = time.perf_counter()
+            found = len(fn(text))
+            best = min(best, time.perf_counter() - started)
+    return len(text) / (1024 * 1024) / best, found
+
+
+def peak_memory(fn, text) -> float:
+    """Peak MB allocated while extracting (excluding the input text itself)."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        tracemalloc.start()
+        fn(text)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return peak / (1024 * 1024)
+
+
+def streamed(extractor, page_size: int = 4000):
+    def run(text):
+        stream = extractor.stream()
+        for i in range(0, len(text), page_size):
+            stream.feed(text[i:i + page_size])
+        return stream.close()
+    return run
+
+
+def main():
+    megabytes = float(sys.argv[1]) if len(sys.argv) > 1 else 8
+    extractor = ObligationExtractor()
+    for name, rate in (("dense", 0.3), ("sparse", 0.05)):
+        text = make_regulation(megabytes, rate)
+        print(f"[{name}] text: {len(text) / (1024 * 1024):.1f} MB, {rate:.0%} obligation paragraphs")
+        legacy, legacy_found = throughput(legacy_extract, text)
+        print(f"  legacy:   {legacy:6.1f} MB/sec ({legacy_found} obligations)  "
+              f"peak {peak_memory(legacy_extract, text):6.1f} MB")
+        for label, fn in (("current", extractor.match), ("streamed", streamed(extractor))):
+            current, found = throughput(fn, text)
+            print(f"  {label + ':':9} {current:6.1f} MB/sec ({found} obligations)  "
+                  f"peak {peak_memory(fn, text):6.1f} MB  speedup: {current / legacy:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Benchmark: LogMonitor throughput (events/sec) against the previous per-event scanner.
+
+Each workload's speedup is reported against the TARGET_SPEEDUP goal; none is singled out
+as the acceptance case. Measured on the reference machine (20,000 events, best of 3):
+  api logs       ~6x    (representative traffic; not at target)
+  numeric        ~3.5x  (not at target: the old scanner stops at its first false
+                         positive, reading space-separated numbers as card numbers)
+  long payloads  ~9-11x (where the old card regex backtracks)
+On short payloads the new scanner is bound by one substring pass over the batch's shape
+view per detector trigger, ~9 passes in all.
+
+Run from server/:  python -m benchmarks.bench_monitor [events]
+"""
+import re
+import sys
+import time
+import random
+import uuid
+import contextlib
+import io
+
+from tools.monitor import LogMonitor
+
+TARGET_SPEEDUP = 10.0
+
+
+def legacy_scan(logs):
+    """The pre-rewrite LogMonitor.scan_for_anomalies, kept for comparison."""
+    anomalies = []
+    cc_pattern = re.compile(r'\b(?:\d[ -]*?){13,16}\b')
+    email_pattern = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+    for log in logs:
+        payload = str(log.get("payload", "")) or str(log)
+        if cc_pattern.search(payload):
+            log['detected_pattern'] = "Potential Credit Card Number (PCI Violation)"
+            anomalies.append(log)
+        elif email_pattern.search(payload) and log.get("sensitive", False) is True:
+            log['detected_pattern'] = "Email leak in restricted stream (PII Violation)"
+            anomalies.append(log)
+    return anomalies
+
+
+def make_events(n: int, seed: int = 7):
+    """Structured API log lines: timestamps, request ids, status codes and amounts; ~1% carry PII."""
+    rng = random.Random(seed)
+    paths = ["/api/v1/payments", "/api/v1/users/login", "/api/v1/orders", "/healthz", "/api/v1/refunds"]
+    leaks = ["card=4111 1111 1111 1111", "contact=jane.doe@example.com", "ssn=123-45-6789",
+             "iban=DE89 3704 0044 0532 0130 00", "phone=+1 415-555-2671"]
+    events = []
+    for i in range(n):
+        payload = (
+            f"2024-05-{rng.randint(1, 28):02d}T{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:"
+            f"{rng.randint(0, 59):02d}.{rng.randint(0, 999):03d}Z INFO api "
+            f"request_id={uuid.UUID(int=rng.getrandbits(128))} method={rng.choice(['GET', 'POST'])} "
+            f"path={rng.choice(paths)} status={rng.choice([200, 200, 201, 404, 500])} "
+            f"latency_ms={rng.randint(2, 900)} user_id={rng.randint(1000, 999999)} "
+            f"amount={rng.randint(1, 5000)}.{rng.randint(0, 99):02d} currency=EUR region=eu-west-1"
+        )
+        if rng.random() < 0.01:
+            payload += " " + rng.choice(leaks)
+        events.append({"id": i, "payload": payload, "sensitive": rng.random() < 0.5})
+    return events
+
+
+def make_numeric_events(n: int, seed: int = 7):
+    """Digit-heavy payloads (space-separated counters), the worst case for the trigger prefilter."""
+    rng = random.Random(seed)
+    words = ["GET", "POST", "/api/v1/payments", "status=200", "user", "session", "latency_ms",
+             "txn", "amount", "EUR", "ok", "retry", "upstream", "timeout", "region=eu-west-1"]
+    events = []
+    for i in range(n):
+        parts = [rng.choice(words) for _ in range(rng.randint(20, 60))]
+        parts += [str(rng.randint(10 ** 5, 10 ** 12)) for _ in range(rng.randint(3, 8))]
+        roll = rng.random()
+        if roll < 0.01:
+            parts.append("4111 1111 1111 1111")
+        elif roll < 0.02:
+            parts.append("jane.doe@example.com")
+        rng.shuffle(parts)
+        events.append({"id": i, "payload": " ".join(parts), "sensitive": rng.random() < 0.5})
+    return events
+
+
+def make_long_events(n: int, seed: int = 7, size: int = 4096):
+    """
+    Long digit-dense payloads (metric dumps): runs of small counters and percentages
+    separated by spaces and dashes, broken by a label before they reach card length.
+    The old card regex restarts at every number and walks each run before failing.
+    """
+    rng = random.Random(seed)
+    words = ["ok", "cpu", "mem", "io", "gc", "net", "p99", "rtt"]
+    events = []
+    for i in range(n):
+        parts, length = [], 0
+        while length < size:
+            digits, run = 0, []
+            while digits < 10:
+                group = str(rng.randint(0, 99))
+                run.append(group)
+                digits += len(group)
+            chunk = rng.choice(" -").join(run) + " " + rng.choice(words)
+            parts.append(chunk)
+            length += len(chunk) + 1
+        if rng.random() < 0.01:
+            parts.insert(rng.randrange(len(parts)), "card 4111 1111 1111 1111")
+        events.append({"id": i, "payload": " ".join(parts), "sensitive": rng.random() < 0.5})
+    return events
+
+
+def throughput(fn, events, repeat: int = 3):
+    """Best-of-repeat events/sec and the number of events flagged."""
+    best = float("inf")
+    for _ in range(repeat):
+        batch = [dict(e) for e in events]
+        with contextlib.redirect_stdout(io.StringIO()):
+            started = time.perf_counter()
+            flagged = len(fn(batch))
+            best = min(best, time.perf_counter() - started)
+    return len(events) / best, flagged
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    monitor = LogMonitor()
+    print(f"events: {n}")
+    workloads = (("api logs", make_events(n)), ("numeric", make_numeric_events(n)),
+                 ("long payloads", make_long_events(max(n // 20, 1))))
+    speedups = {}
+    for name, events in workloads:
+        legacy, legacy_flagged = throughput(legacy_scan, events)
+        current, flagged = throughput(monitor.scan_for_anomalies, events)
+        print(f"[{name}] legacy: {legacy:,.0f} events/sec ({legacy_flagged} flagged)  "
+              f"current: {current:,.0f} events/sec ({flagged} flagged)  speedup: {current / legacy:.1f}x")
+        speedups[name] = current / legacy
+    print(f"target {TARGET_SPEEDUP:.0f}x: " + ", ".join(
+        f"{name} {speedup:.1f}x ({'reached' if speedup >= TARGET_SPEEDUP else 'not reached'})"
+        for name, speedup in speedups.items()
+    ))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 import os
-from sqlalchemy import create_engine
+from datetime import datetime
+from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, Index
 from sqlalchemy.orm import sessionmaker, declarative_base
 from dotenv import load_dotenv
 
@@ -22,6 +23,54 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 
+class FindingRecord(Base):
+    """A compliance gap reported by the Gap Analyst."""
+    __tablename__ = "findings"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    client = Column(String(255), index=True)
+    severity = Column(String(16), nullable=False, index=True)
+    status = Column(String(32), nullable=False, index=True)
+    impact = Column(String(16))
+    likelihood = Column(String(16))
+    finding = Column(Text, nullable=False)
+    action_taken = Column(Text)
+    created_at = Column(DateTime, nullable=False, default=datetime.now, index=True)
+
+    __table_args__ = (Index("ix_findings_client_created", "client", "created_at"),)
+
+
+class AlertRecord(Base):
+    """An anomaly raised by the Risk Sentinel."""
+    __tablename__ = "alerts"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    client = Column(String(255), index=True)
+    severity = Column(String(16), nullable=False, index=True)
+    status = Column(String(32), nullable=False, index=True)
+    detector = Column(String(64))
+    detected_pattern = Column(String(255))
+    event_id = Column(String(255))
+    ticket = Column(String(64))
+    created_at = Column(DateTime, nullable=False, default=datetime.now, index=True)
+
+    __table_args__ = (Index("ix_alerts_client_created", "client", "created_at"),)
+
+
+class ReportRecord(Base):
+    """A rendered PDF report in REPORTS_DIR."""
+    __tablename__ = "reports"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    filename = Column(String(255), nullable=False, unique=True)
+    client = Column(String(255), index=True)
+    compliance_score = Column(Integer)
+    size_bytes = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, nullable=False, default=datetime.now, index=True)
+
+    __table_args__ = (Index("ix_reports_client_created", "client", "created_at"),)
+
+
 def get_db():
     """Dependency for FastAPI to get database session."""
     db = SessionLocal()
@@ -1,17 +1,28 @@
-from fastapi import FastAPI, HTTPException, UploadFile, File
+from fastapi import FastAPI, HTTPException, UploadFile, File, Request, Response, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from typing import List, Optional
+from datetime import datetime
 from pydantic import BaseModel
 import asyncio
 import tempfile
+import json
+import time
 import os
 
 # Import Agents and Services
 from models import ComplianceFinding, Regulation, DashboardMetrics
-from services.llm import LLMService
+from services.llm import LLMService, LLMUnavailableError
 from services.rag_service import RAGService
+from services.ingest_pipeline import IngestPipeline
+from services.stream_monitor import StreamMonitor
+from services.metrics import compliance_score as score_findings
+from services.findings_store import FindingsStore
+from services.report_jobs import ReportJobs
+from services.report_catalog import ReportCatalog
+from services.policy_batch import PolicyBatch
+from services.health import HealthMonitor
 from agents.scout import RegulatoryScout
 from agents.analyst import GapAnalyst
 from agents.sentinel import RiskSentinel
@@ -35,15 +46,37 @@ init_db()
 # Setup Services
 llm_service = LLMService()
 rag_service = RAGService()
+findings_store = FindingsStore()
 
 # Initialize Agents
 scout = RegulatoryScout(llm_service, rag_service)
-analyst = GapAnalyst(llm_service, rag_service)
-sentinel = RiskSentinel()
+analyst = GapAnalyst(llm_service, rag_service, findings_store)
+sentinel = RiskSentinel(findings_store)
 officer = EvidenceOfficer()
 
 # Tools
 doc_reader = DocumentReader()
+ingest_pipeline = IngestPipeline(doc_reader, scout, rag_service)
+stream_monitor = StreamMonitor(sentinel)
+report_catalog = ReportCatalog(REPORTS_DIR)
+report_jobs = ReportJobs(officer, catalog=report_catalog)
+health_monitor = HealthMonitor(llm_service, rag_service)
+
+# Dashboard counters continue from the persisted findings
+analyst.metrics.seed(findings_store.aggregate_findings())
+# Index reports already on disk; afterwards the catalog is maintained on write/delete
+report_catalog.sync()
+
+@app.on_event("startup")
+async def start_health_probes():
+    health_monitor.start()
+
+@app.on_event("shutdown")
+async def shutdown_workers():
+    await health_monitor.stop()
+    await stream_monitor.stop()
+    report_jobs.close()
+    doc_reader.close()
 
 # Allow CORS for the frontend
 app.add_middleware(
@@ -52,8 +85,18 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Activity-Cursor", "ETag"],
 )
 
+@app.exception_handler(LLMUnavailableError)
+async def llm_unavailable(request: Request, exc: LLMUnavailableError):
+    """Provider outage after all retries: tell clients to come back later instead of a bare 500."""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": f"LLM provider unavailable: {exc}"},
+        headers={"Retry-After": str(int(llm_service.retry_max))}
+    )
+
 @app.get("/")
 async def root():
     return {
@@ -94,29 +137,21 @@ async def update_settings(settings: dict):
 
 @app.get("/api/status")
 async def get_api_status():
-    """Check status of all API connections including Gemini."""
-    gemini_status = "disconnected"
-    gemini_message = "API key not configured"
-    
-    # Check if Gemini is configured
-    if llm_service.model:
-        try:
-            # Try a simple completion to verify connectivity
-            test_response = await llm_service.complete("Say 'OK' if you are working.")
-            if test_response and len(test_response) > 0:
-                gemini_status = "connected"
-                gemini_message = "Gemini API is operational"
-        except Exception as e:
-            gemini_status = "error"
-            gemini_message = str(e)
+    """Status of all API connections including Gemini, from the background health probes."""
+    health_monitor.start()  # no-op once running
+    probes = health_monitor.snapshot()
+    gemini = health_monitor.states["gemini"]
+    rag_stats = health_monitor.states["vector_store"].detail
     
     return {
         "backend": "connected",
         "gemini": {
-            "status": gemini_status,
-            "message": gemini_message
+            "status": gemini.status,
+            "message": gemini.message
         },
-        "rag": rag_service.get_stats(),
+        "rag": rag_stats if rag_stats is not None else rag_service.get_stats(),
+        "llm_cache": llm_service.get_cache_stats(),
+        "probes": probes,
         "agents": {
             "scout": app_settings.get("scoutEnabled", True),
             "sentinel": app_settings.get("sentinelEnabled", True),
@@ -127,55 +162,74 @@ async def get_api_status():
 @app.get("/api/dashboard", response_model=DashboardMetrics)
 async def get_dashboard_metrics():
     """Get high-level dashboard metrics based on actual analysis data."""
-    # Get real data from services
-    rag_stats = rag_service.get_stats()
-    doc_count = rag_stats.get("document_count", 0)
-    
-    # Count actual findings from analyst activity logs
-    gap_count = 0
-    critical_count = 0
-    high_count = 0
+    doc_count = rag_service.document_count()
     
-    for log in analyst.activity_log:
-        action = log.action if hasattr(log, 'action') else str(log)
-        if 'Gap' in action or 'Finding' in action:
-            gap_count += 1
-        if 'Critical' in action:
-            critical_count += 1
-        if 'High' in action or 'Risk' in action:
-            high_count += 1
-    
-    # Calculate score dynamically:
-    # - Start at 100 (no gaps)
-    # - Deduct points based on actual findings
-    # - Critical = -15 points, High = -10 points, Other gaps = -5 points
-    deductions = (critical_count * 15) + (high_count * 10) + (max(0, gap_count - critical_count - high_count) * 5)
-    score = max(0, 100 - deductions)
+    # Counters are maintained by the analyst as findings are produced
+    counters = analyst.metrics.snapshot()
+    score = score_findings(counters)
     
     # If no documents uploaded yet, score should reflect that
     if doc_count == 0:
         score = 0  # No analysis done yet
     
     # Risks = actual gap findings
-    risks = gap_count + critical_count + high_count
+    risks = counters["findings"] + counters["critical"] + counters["high"]
     
     # Policies mapped = based on what's in RAG
     policies_mapped = doc_count * 50  # 50 policy items per document average
     
-    # Pending reviews = gaps that need manual review
-    pending_reviews = 0
-    for log in analyst.activity_log:
-        action = log.action if hasattr(log, 'action') else str(log)
-        if 'Pending' in action or 'Manual Review' in action or 'DISABLED' in action:
-            pending_reviews += 1
-    
     return DashboardMetrics(
         score=score,
         risks=risks,
         policies_mapped=policies_mapped,
-        pending_reviews=pending_reviews
+        pending_reviews=counters["pending_reviews"]
     )
 
+@app.get("/api/dashboard/trends")
+async def get_dashboard_trends(limit: Optional[int] = None):
+    """Dashboard counters over time, one point per bucket with findings (METRICS_BUCKET_SECONDS)."""
+    return {"totals": analyst.metrics.snapshot(), "series": analyst.metrics.series(limit)}
+
+# ==================== FINDINGS & ALERTS ====================
+
+@app.get("/api/findings")
+async def list_findings(client: Optional[str] = None, severity: Optional[str] = None,
+                        status: Optional[str] = None, since: Optional[datetime] = None,
+                        until: Optional[datetime] = None, cursor: Optional[int] = None, limit: int = 50):
+    """Stored Gap Analyst findings, newest first. Pass next_cursor back as cursor for the next page."""
+    return await asyncio.to_thread(
+        findings_store.query_findings, client=client, severity=severity, status=status,
+        since=since, until=until, cursor=cursor, limit=limit
+    )
+
+@app.get("/api/findings/summary")
+async def summarize_findings(client: Optional[str] = None):
+    """Finding counts by severity and status, aggregated in SQL."""
+    totals = await asyncio.to_thread(findings_store.aggregate_findings, client)
+    return {"client": client, **totals, "score": score_findings(totals)}
+
+@app.get("/api/alerts")
+async def list_alerts(client: Optional[str] = None, severity: Optional[str] = None,
+                      status: Optional[str] = None, since: Optional[datetime] = None,
+                      until: Optional[datetime] = None, cursor: Optional[int] = None, limit: int = 50):
+    """Stored Risk Sentinel alerts, newest first. Pass next_cursor back as cursor for the next page."""
+    return await asyncio.to_thread(
+        findings_store.query_alerts, client=client, severity=severity, status=status,
+        since=since, until=until, cursor=cursor, limit=limit
+    )
+
+@app.get("/api/alerts/summary")
+async def summarize_alerts(client: Optional[str] = None):
+    """Alert counts by severity, aggregated in SQL."""
+    totals = await asyncio.to_thread(findings_store.aggregate_alerts, client)
+    return {"client": client, **totals}
+
+@app.post("/api/findings/score")
+async def score_findings_batch(findings: List[str]):
+    """Re-score finding texts with the Gap Analyst's risk rules (e.g. to re-baseline history)."""
+    scorer = analyst.use_tool("RiskScorer")
+    return await asyncio.to_thread(scorer.score_batch, findings)
+
 # ==================== AGENT ENDPOINTS ====================
 
 @app.post("/api/agents/scan")
@@ -189,58 +243,53 @@ async def trigger_regulatory_scan():
     
     # Use LLM to generate a realistic policy for analysis
     policy_sample = await llm_service.complete(
-        "Generate a sample corporate data retention policy that might have GDPR compliance issues."
+        "Generate a sample corporate data retention policy that might have GDPR compliance issues.", agent="Scan"
     )
     gap_analysis = await analyst.analyze_policy(policy_sample)
     
     return {
-        "scout_logs": scout.activity_log,
+        "scout_logs": scout.get_activity_log(),
         "analyst_findings": gap_analysis
     }
 
 @app.post("/api/agents/ingest")
-async def ingest_documents(files: List[UploadFile] = File(...)):
+async def ingest_documents(files: List[UploadFile] = File(...), stream: bool = False):
     """
     Ingest a regulatory document (PDF or TXT).
     The Scout agent will process and index it.
-    Accepts multiple files at once.
+    Accepts multiple files at once; files are processed concurrently through
+    the ingest pipeline. With stream=true, per-file results are sent as NDJSON
+    lines as each file completes.
     """
-    results = []
-    
+    # Spool each upload to disk instead of holding it in memory
+    uploads = []
     for file in files:
-        content = await file.read()
-        
-        # Extract client/document name from filename
-        client_name = file.filename.rsplit('.', 1)[0]  # Remove extension
-        
-        try:
-            text = doc_reader.read_bytes(content, file.filename)
-        except Exception as e:
-            results.append({
-                "filename": file.filename,
-                "status": "error",
-                "error": str(e)
-            })
-            continue
-        
-        # Set client context for logging
-        scout.set_current_client(client_name)
-        analyst.set_current_client(client_name)
-        
-        # Process with Scout
-        result = await scout.process_regulation(text, file.filename)
-        
-        results.append({
-            "filename": file.filename,
-            "client": client_name,
-            "chars_extracted": len(text),
-            "status": "processed",
-            "processing_result": result
-        })
+        path, doc_id = await ingest_pipeline.spool(file)
+        uploads.append((file.filename, path, doc_id))
+    started = time.perf_counter()
+
+    if stream:
+        async def result_lines():
+            results = []
+            async for result in ingest_pipeline.run(uploads):
+                results.append(result)
+                yield json.dumps(result, default=str) + "\n"
+            yield json.dumps({
+                "event": "complete",
+                "files_processed": len(results),
+                "stage_timings": ingest_pipeline.summarize_timings(results),
+                "wall_ms": round((time.perf_counter() - started) * 1000, 3)
+            }) + "\n"
+        return StreamingResponse(result_lines(), media_type="application/x-ndjson")
+
+    results = [result async for result in ingest_pipeline.run(uploads)]
+    results.sort(key=lambda r: r["index"])
     
     return {
         "files_processed": len(results),
         "results": results,
+        "stage_timings": ingest_pipeline.summarize_timings(results),
+        "wall_ms": round((time.perf_counter() - started) * 1000, 3),
         "scout_logs": scout.get_activity_log(10)  # Last 10 logs with timestamps
     }
 
@@ -257,8 +306,42 @@ async def analyze_policy(policy_text: str, client_name: str = "Unknown Client"):
         "analyst_logs": analyst.get_activity_log(10)
     }
 
+class PolicyBatchRequest(BaseModel):
+    policies: List[str]
+    client_name: str = "Unknown Client"
+
+@app.post("/api/agents/analyze/batch")
+async def analyze_policies(request: PolicyBatchRequest, stream: bool = False):
+    """
+    Analyze many policies concurrently (bounded by POLICY_BATCH_CONCURRENCY), sharing
+    RAG lookups between identical policies. With stream=true, each result is sent as an
+    NDJSON line as soon as it finishes, followed by a "complete" line with throughput.
+    """
+    batch = PolicyBatch(analyst)
+
+    if stream:
+        async def result_lines():
+            async for result in batch.run(request.policies, request.client_name):
+                yield json.dumps(result, default=str) + "\n"
+            yield json.dumps({"event": "complete", **batch.get_stats()}) + "\n"
+        return StreamingResponse(result_lines(), media_type="application/x-ndjson")
+
+    results = [result async for result in batch.run(request.policies, request.client_name)]
+    results.sort(key=lambda r: r["index"])
+    return {"client": request.client_name, "results": results, **batch.get_stats()}
+
+@app.get("/api/llm/usage")
+async def get_llm_usage():
+    """LLM calls, tokens, retries and rate-limit waits per agent, plus the shared limiter state."""
+    return llm_service.get_usage()
+
+@app.get("/api/agents/prompts")
+async def get_prompt_usage():
+    """Prompt sizes in (approximate) tokens and context packing counters per agent."""
+    return {"Regulatory Scout": scout.packer.get_stats(), "Gap Analyst": analyst.packer.get_stats()}
+
 @app.post("/api/agents/monitor")
-async def trigger_monitoring_batch():
+async def trigger_monitoring_batch(events: Optional[List[dict]] = None):
     """Trigger the Risk Sentinel to check a batch of transactions."""
     # Check if sentinel is enabled
     if not app_settings.get("sentinelEnabled", True):
@@ -269,36 +352,229 @@ async def trigger_monitoring_batch():
         {"id": 2, "amount": 50000, "contains_pii": False},
         {"id": 3, "amount": 200, "contains_pii": True},
     ]
-    alerts = await sentinel.monitor_stream(mock_stream)
+    alerts = await sentinel.monitor_stream(events or mock_stream)
     return {"alerts": alerts, "sentinel_logs": sentinel.get_activity_log(10)}
 
+def _as_event(value) -> dict:
+    """Streamed events are JSON objects; bare values are wrapped as the payload."""
+    return value if isinstance(value, dict) else {"payload": value}
+
+@app.post("/api/agents/monitor/stream")
+async def stream_monitoring(request: Request):
+    """
+    Ingest a bounded NDJSON batch (one event per line, chunked uploads welcome) into the Risk Sentinel.
+    The body is read as it arrives and reading pauses while the scan queue is full, but the
+    response only starts once the upload ends, and at most STREAM_OUTBOX_SIZE alerts are held
+    until then (the rest are counted as dropped). Continuous feeds should use the WebSocket
+    at /api/agents/monitor/ws, which pushes alerts while events are still arriving.
+    Returns NDJSON: one "alert" line per anomaly, then a "summary" line.
+    """
+    if not app_settings.get("sentinelEnabled", True):
+        raise HTTPException(status_code=409, detail="Risk Sentinel is disabled in settings")
+
+    started = time.perf_counter()
+    session = stream_monitor.open_session()
+    rejected = []
+    buffer = b""
+    line_number = 0
+
+    async def feed(line: bytes):
+        nonlocal line_number
+        line_number += 1
+        if not line.strip():
+            return
+        try:
+            await session.put(_as_event(json.loads(line)))
+        except ValueError as e:
+            rejected.append({"type": "error", "line": line_number, "error": str(e)})
+
+    try:
+        async for chunk in request.stream():
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                await feed(line)
+        await feed(buffer)
+    except BaseException:
+        session.close()
+        raise
+
+    async def results():
+        try:
+            for error in rejected:
+                yield json.dumps(error) + "\n"
+            drained = asyncio.create_task(session.drain())
+            while True:
+                next_alert = asyncio.create_task(session.outbox.get())
+                await asyncio.wait({next_alert, drained}, return_when=asyncio.FIRST_COMPLETED)
+                if not next_alert.done():
+                    next_alert.cancel()
+                    break
+                yield json.dumps({"type": "alert", **next_alert.result()}) + "\n"
+            while not session.outbox.empty():
+                yield json.dumps({"type": "alert", **session.outbox.get_nowait()}) + "\n"
+            yield json.dumps({
+                "type": "summary",
+                "events": session.received,
+                "alerts": session.alerts,
+                "alerts_dropped": session.dropped,
+                "rejected": len(rejected),
+                "wall_ms": round((time.perf_counter() - started) * 1000, 3)
+            }) + "\n"
+        finally:
+            session.close()
+
+    return StreamingResponse(results(), media_type="application/x-ndjson")
+
+@app.websocket("/api/agents/monitor/ws")
+async def stream_monitoring_ws(websocket: WebSocket):
+    """
+    Full-duplex feed for the Risk Sentinel. Each text frame is one JSON event, a JSON
+    array of events, or NDJSON lines; alerts are pushed back as {"type": "alert", ...}
+    while the client keeps sending. Frames stop being read while the scan queue is full.
+    """
+    await websocket.accept()
+    if not app_settings.get("sentinelEnabled", True):
+        await websocket.close(code=1013, reason="Risk Sentinel is disabled in settings")
+        return
+
+    session = stream_monitor.open_session()
+
+    async def send_alerts():
+        try:
+            while True:
+                alert = await session.outbox.get()
+                await websocket.send_json({"type": "alert", **alert})
+        except Exception as e:
+            # Stop accepting events nobody can receive alerts for
+            print(f"[StreamMonitor] Alert delivery failed, closing session: {e}")
+            session.close()
+
+    sender = asyncio.create_task(send_alerts())
+    try:
+        while True:
+            message = await websocket.receive_text()
+            if session.closed:
+                await websocket.close(code=1011, reason="Alert delivery failed")
+                break
+            try:
+                values = [json.loads(line) for line in message.splitlines() if line.strip()]
+            except ValueError as e:
+                await websocket.send_json({"type": "error", "error": str(e)})
+                continue
+            for value in values:
+                for event in (value if isinstance(value, list) else [value]):
+                    await session.put(_as_event(event))
+    except WebSocketDisconnect:
+        pass
+    finally:
+        sender.cancel()
+        session.close()
+
+@app.get("/api/agents/monitor/metrics")
+async def get_monitoring_metrics():
+    """Streaming ingestion throughput, queue depth and backpressure counters."""
+    return stream_monitor.get_stats()
+
+REPORT_MAX_FINDINGS = int(os.getenv("REPORT_MAX_FINDINGS", "200"))
+
+def _report_finding(record: dict) -> dict:
+    """Map a stored finding to the fields the PDF report reads."""
+    text = record["finding"] or ""
+    return {
+        "title": text.strip().split("\n", 1)[0][:80] or "Issue Detected",
+        "severity": record["severity"],
+        "description": text,
+        "remediation": record["action_taken"] or ""
+    }
+
 class ReportRequest(BaseModel):
     findings: List[dict] = []
     client_name: str = "Unknown Client"
     compliance_score: Optional[int] = None
 
-@app.post("/api/agents/report")
-async def generate_audit_report(request: ReportRequest = None):
-    """Generate a PDF audit report for a specific client."""
-    # Handle empty request
-    if request is None:
-        request = ReportRequest()
-    
+async def _prepare_report(request: ReportRequest):
+    """Resolve the findings and score a report will be rendered with."""
     findings = request.findings
     client_name = request.client_name
     compliance_score = request.compliance_score
     
-    # If no score provided, calculate from dashboard metrics
-    if compliance_score is None:
-        rag_stats = rag_service.get_stats()
-        doc_count = rag_stats.get("document_count", 0)
+    # Without findings in the request, report what is stored for this client
+    persisted = None
+    if not findings or compliance_score is None:
+        persisted = await asyncio.to_thread(findings_store.aggregate_findings, client_name)
+    if not findings and persisted["findings"]:
+        page = await asyncio.to_thread(
+            findings_store.query_findings, client=client_name, limit=REPORT_MAX_FINDINGS
+        )
+        findings = [_report_finding(f) for f in page["items"]]
+    
+    # If no score provided, calculate from stored findings, else from dashboard metrics
+    if compliance_score is None and persisted["findings"]:
+        compliance_score = score_findings(persisted)
+    elif compliance_score is None:
+        doc_count = rag_service.document_count()
         base_score = 60
         doc_bonus = min(doc_count * 5, 20)
         activity_bonus = min(len(scout.activity_log) + len(analyst.activity_log), 20)
         compliance_score = min(base_score + doc_bonus + activity_bonus, 100)
     
-    result = await officer.generate_package(findings, client_name, compliance_score)
-    return result
+    return findings, client_name, compliance_score
+
+@app.post("/api/agents/report")
+async def generate_audit_report(request: ReportRequest = None):
+    """Generate a PDF audit report for a specific client (waits for the render job)."""
+    # Handle empty request
+    if request is None:
+        request = ReportRequest()
+    
+    job = report_jobs.submit(*await _prepare_report(request))
+    await report_jobs.wait(job)
+    if job.status == "error":
+        raise HTTPException(status_code=500, detail=f"Report generation failed: {job.error}")
+    return job.result
+
+def _job_response(job) -> dict:
+    return {"job_id": job.id, "client": job.client, "status": job.status,
+            "status_url": f"/api/reports/jobs/{job.id}", "events_url": f"/api/reports/jobs/{job.id}/events"}
+
+@app.post("/api/reports/jobs", status_code=202)
+async def submit_report_job(request: ReportRequest = None):
+    """Queue a report; poll status_url or stream events_url for progress."""
+    job = report_jobs.submit(*await _prepare_report(request or ReportRequest()))
+    return _job_response(job)
+
+@app.post("/api/reports/jobs/batch", status_code=202)
+async def submit_report_jobs(requests: List[ReportRequest]):
+    """Queue one report per request (e.g. month-end reports for every client)."""
+    jobs = [report_jobs.submit(*await _prepare_report(request)) for request in requests]
+    return {"jobs": [_job_response(job) for job in jobs]}
+
+@app.get("/api/reports/jobs")
+async def report_job_stats():
+    return report_jobs.get_stats()
+
+@app.get("/api/reports/jobs/{job_id}")
+async def get_report_job(job_id: str):
+    job = report_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Report job not found")
+    return job.to_dict()
+
+@app.get("/api/reports/jobs/{job_id}/events")
+async def stream_report_job(job_id: str):
+    """NDJSON progress events (queued, compiling, rendering, done/error) until the job finishes."""
+    job = report_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Report job not found")
+
+    async def events():
+        async for event in job.follow():
+            yield json.dumps({"job_id": job.id, **event}) + "\n"
+        if job.result is not None:
+            yield json.dumps({"job_id": job.id, "status": "result", **job.result}) + "\n"
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
 
 @app.delete("/api/reports/{filename}")
 async def delete_report(filename: str):
@@ -306,18 +582,32 @@ async def delete_report(filename: str):
     filepath = os.path.join(REPORTS_DIR, filename)
     if os.path.exists(filepath):
         os.remove(filepath)
+        await asyncio.to_thread(report_catalog.remove, filename)
         return {"status": "deleted", "filename": filename}
     raise HTTPException(status_code=404, detail="Report not found")
 
 @app.get("/api/agents/activity")
-async def get_agent_activities():
-    """Aggregate logs from all agents with timestamps."""
-    return {
-        "Regulatory Scout": scout.get_activity_log(15),
-        "Gap Analyst": analyst.get_activity_log(15),
-        "Risk Sentinel": sentinel.get_activity_log(15),
-        "Evidence Officer": officer.get_activity_log(15)
+async def get_agent_activities(response: Response, since: Optional[int] = None, limit: int = 15,
+                               client: Optional[str] = None):
+    """
+    Aggregate logs from all agents with timestamps.
+    Pass the X-Activity-Cursor header of the previous response as `since` to get only newer
+    entries (each entry's `seq` can be used to drop repeats); `client` filters to one client.
+    """
+    agents = {
+        "Regulatory Scout": scout,
+        "Gap Analyst": analyst,
+        "Risk Sentinel": sentinel,
+        "Evidence Officer": officer
     }
+    logs = {name: agent.get_activity_log(limit, since, client) for name, agent in agents.items()}
+
+    # Resume after the last entry of any agent that was cut off by limit, so nothing is skipped
+    truncated = [entries[-1]["seq"] for entries in logs.values() if since is not None and len(entries) == limit]
+    newest = [entries[-1]["seq"] for entries in logs.values() if entries]
+    cursor = min(truncated) if truncated else max(newest, default=since or 0)
+    response.headers["X-Activity-Cursor"] = str(cursor)
+    return logs
 
 # ==================== WEBHOOK ENDPOINTS (for n8n) ====================
 
@@ -332,7 +622,7 @@ async def webhook_regulation_alert(payload: dict):
     return {
         "status": "processed",
         "title": title,
-        "logs": scout.activity_log[-3:]
+        "logs": scout.get_activity_log(3)
     }
 
 @app.post("/api/webhooks/policy-review")
@@ -355,29 +645,32 @@ async def get_knowledge_stats():
     return rag_service.get_stats()
 
 @app.post("/api/knowledge/query")
-async def query_knowledge(query: str, top_k: int = 3):
-    """Query the knowledge base."""
-    results = await rag_service.query(query, top_k)
-    return {"query": query, "results": results}
+async def query_knowledge(query: str, top_k: int = 3, mode: Optional[str] = None):
+    """Query the knowledge base (mode: hybrid, vector or lexical)."""
+    try:
+        result = await rag_service.search(query, top_k, mode)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"query": query, **result}
 
 # ==================== REPORTS ENDPOINTS ====================
 
 @app.get("/api/reports")
-async def list_reports():
-    """List all generated PDF reports."""
-    reports = []
-    for filename in os.listdir(REPORTS_DIR):
-        if filename.endswith(".pdf"):
-            filepath = os.path.join(REPORTS_DIR, filename)
-            reports.append({
-                "filename": filename,
-                "size_bytes": os.path.getsize(filepath),
-                "created_at": os.path.getctime(filepath),
-                "download_url": f"/api/reports/download/{filename}"
-            })
-    # Sort by creation time, newest first
-    reports.sort(key=lambda x: x["created_at"], reverse=True)
-    return {"reports": reports, "count": len(reports)}
+async def list_reports(request: Request, response: Response, client: Optional[str] = None,
+                       since: Optional[datetime] = None, until: Optional[datetime] = None,
+                       cursor: Optional[int] = None, limit: int = 50):
+    """
+    List generated PDF reports, newest first, from the report catalog.
+    Pass next_cursor as `cursor` for the next page. Send the ETag back in If-None-Match
+    to get a 304 when nothing changed.
+    """
+    etag = report_catalog.etag(client, since, until, cursor, limit)
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return await asyncio.to_thread(
+        report_catalog.query, client=client, since=since, until=until, cursor=cursor, limit=limit
+    )
 
 @app.get("/api/reports/download/{filename}")
 async def download_report(filename: str):
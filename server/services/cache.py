@@ -0,0 +1,156 @@
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Optional, Dict, Any
+
+
+class TieredCache:
+    """
+    Two-tier byte cache: an in-memory LRU in front of a SQLite table.
+    Entries expire after ttl_seconds; each tier evicts least-recently-used entries past its size limit.
+    Disk-hit access times are buffered and written in one batch (every touch_batch hits, or
+    with the next set()), so a hit does not cost a write and commit.
+    """
+    def __init__(self, path: str, table: str, memory_entries: int = 512,
+                 disk_entries: int = 10000, ttl_seconds: float = None, touch_batch: int = 64):
+        self.path = path
+        self.table = table
+        self.memory_entries = memory_entries
+        self.disk_entries = disk_entries
+        self.ttl_seconds = ttl_seconds
+        self.touch_batch = touch_batch
+        self._touched: Dict[str, float] = {}  # key -> accessed_at not yet written
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (value, created_at)
+        self._lock = threading.Lock()
+        self.hits = {"memory": 0, "disk": 0}
+        self.misses = 0
+        self.evictions = 0
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_accessed ON {table} (accessed_at)")
+        self._conn.commit()
+        self._disk_count = self._conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+    @staticmethod
+    def make_key(*parts: str) -> str:
+        """Hash key parts into a fixed-size cache key."""
+        return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        return self.ttl_seconds is not None and now - created_at > self.ttl_seconds
+
+    def get(self, key: str) -> Optional[bytes]:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if not self._expired(entry[1], now):
+                    self._memory.move_to_end(key)
+                    self.hits["memory"] += 1
+                    return entry[0]
+                del self._memory[key]
+
+            row = self._conn.execute(
+                f"SELECT value, created_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            value, created_at = row
+            if self._expired(created_at, now):
+                self._touched.pop(key, None)
+                self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                self._conn.commit()
+                self._disk_count -= 1
+                self.misses += 1
+                return None
+
+            self._touched[key] = now
+            if len(self._touched) >= self.touch_batch:
+                self._flush_touches()
+                self._conn.commit()
+            self._remember(key, value, created_at)
+            self.hits["disk"] += 1
+            return value
+
+    def set(self, key: str, value: bytes):
+        now = time.time()
+        with self._lock:
+            self._remember(key, value, now)
+            exists = self._conn.execute(
+                f"SELECT 1 FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, sqlite3.Binary(value), now, now)
+            )
+            if not exists:
+                self._disk_count += 1
+            self._touched.pop(key, None)
+            # Pending access times ride along with this write's commit
+            self._flush_touches()
+            if self._disk_count > self.disk_entries:
+                self._evict_disk(self._disk_count - self.disk_entries)
+            self._conn.commit()
+
+    def _remember(self, key: str, value: bytes, created_at: float):
+        self._memory[key] = (value, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _flush_touches(self):
+        if self._touched:
+            self._conn.executemany(
+                f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?",
+                [(accessed_at, key) for key, accessed_at in self._touched.items()]
+            )
+            self._touched.clear()
+
+    def _evict_disk(self, count: int):
+        """Drop expired rows first, then the least recently used ones."""
+        if self.ttl_seconds is not None:
+            cursor = self._conn.execute(
+                f"DELETE FROM {self.table} WHERE created_at < ?", (time.time() - self.ttl_seconds,)
+            )
+            self._disk_count -= cursor.rowcount
+            self.evictions += cursor.rowcount
+            count -= cursor.rowcount
+        if count > 0:
+            cursor = self._conn.execute(
+                f"DELETE FROM {self.table} WHERE key IN "
+                f"(SELECT key FROM {self.table} ORDER BY accessed_at ASC LIMIT ?)", (count,)
+            )
+            self._disk_count -= cursor.rowcount
+            self.evictions += cursor.rowcount
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._touched.clear()
+            self._conn.execute(f"DELETE FROM {self.table}")
+            self._conn.commit()
+            self._disk_count = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        hits = self.hits["memory"] + self.hits["disk"]
+        lookups = hits + self.misses
+        return {
+            "hits": hits,
+            "memory_hits": self.hits["memory"],
+            "disk_hits": self.hits["disk"],
+            "misses": self.misses,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "memory_entries": len(self._memory),
+            "disk_entries": self._disk_count,
+            "evictions": self.evictions
+        }
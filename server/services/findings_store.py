@@ -0,0 +1,103 @@
+from datetime import datetime
+from typing import List, Dict, Any, Optional
+
+from sqlalchemy import insert, select, func
+
+from database import SessionLocal, FindingRecord, AlertRecord
+from services.metrics import COUNTERS, finding_counters
+
+MAX_PAGE_SIZE = 500
+
+FINDING_FIELDS = ("client", "severity", "status", "impact", "likelihood", "finding", "action_taken")
+ALERT_FIELDS = ("client", "severity", "status", "detector", "detected_pattern", "event_id", "ticket")
+
+
+class FindingsStore:
+    """
+    Persistent findings and alerts (SQLite fallback or Postgres via DATABASE_URL).
+    Writes are bulk INSERTs; reads are keyset-paginated on id, newest first.
+    Methods are blocking; call them through asyncio.to_thread from request handlers.
+    """
+    def __init__(self, session_factory=SessionLocal):
+        self.session_factory = session_factory
+
+    def _insert(self, model, fields, rows: List[Dict[str, Any]]) -> int:
+        if not rows:
+            return 0
+        now = datetime.now()
+        values = [{**{f: row.get(f) for f in fields}, "created_at": row.get("created_at") or now} for row in rows]
+        with self.session_factory() as db:
+            db.execute(insert(model), values)
+            db.commit()
+        return len(values)
+
+    def add_findings(self, rows: List[Dict[str, Any]]) -> int:
+        return self._insert(FindingRecord, FINDING_FIELDS, rows)
+
+    def add_alerts(self, rows: List[Dict[str, Any]]) -> int:
+        return self._insert(AlertRecord, ALERT_FIELDS, rows)
+
+    def _page(self, model, fields, client: str = None, severity: str = None, status: str = None,
+              since: datetime = None, until: datetime = None, cursor: int = None,
+              limit: int = 50) -> Dict[str, Any]:
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        query = select(model)
+        if client is not None:
+            query = query.where(model.client == client)
+        if severity is not None:
+            query = query.where(model.severity == severity)
+        if status is not None:
+            query = query.where(model.status == status)
+        if since is not None:
+            query = query.where(model.created_at >= since)
+        if until is not None:
+            query = query.where(model.created_at < until)
+        if cursor is not None:
+            query = query.where(model.id < cursor)
+        # One extra row tells whether another page exists
+        query = query.order_by(model.id.desc()).limit(limit + 1)
+
+        with self.session_factory() as db:
+            records = db.execute(query).scalars().all()
+        items = [_to_dict(record, fields) for record in records[:limit]]
+        return {
+            "items": items,
+            "next_cursor": items[-1]["id"] if len(records) > limit else None
+        }
+
+    def query_findings(self, **filters) -> Dict[str, Any]:
+        """Filter by client, severity, status and created_at range; pass next_cursor to page."""
+        return self._page(FindingRecord, FINDING_FIELDS, **filters)
+
+    def query_alerts(self, **filters) -> Dict[str, Any]:
+        return self._page(AlertRecord, ALERT_FIELDS, **filters)
+
+    def aggregate_findings(self, client: Optional[str] = None) -> Dict[str, int]:
+        """Counts in the shape of ComplianceMetrics totals, computed with one GROUP BY."""
+        query = select(FindingRecord.severity, FindingRecord.status, func.count()).group_by(
+            FindingRecord.severity, FindingRecord.status
+        )
+        if client is not None:
+            query = query.where(FindingRecord.client == client)
+        with self.session_factory() as db:
+            rows = db.execute(query).all()
+
+        totals = dict.fromkeys(COUNTERS, 0)
+        for severity, status, count in rows:
+            for key, value in finding_counters(severity, status).items():
+                totals[key] += value * count
+        return totals
+
+    def aggregate_alerts(self, client: Optional[str] = None) -> Dict[str, Any]:
+        query = select(AlertRecord.severity, func.count()).group_by(AlertRecord.severity)
+        if client is not None:
+            query = query.where(AlertRecord.client == client)
+        with self.session_factory() as db:
+            by_severity = {severity: count for severity, count in db.execute(query).all()}
+        return {"alerts": sum(by_severity.values()), "by_severity": by_severity}
+
+
+def _to_dict(record, fields) -> Dict[str, Any]:
+    data = {"id": record.id, **{f: getattr(record, f) for f in fields}}
+    data["created_at"] = record.created_at.isoformat() if record.created_at else None
+    return data
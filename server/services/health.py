@@ -0,0 +1,125 @@
+import os
+import time
+import asyncio
+from collections import deque
+from typing import Dict, Any, Optional, Callable, Awaitable
+
+import numpy as np
+
+
+class ProbeState:
+    """Last result of one dependency probe plus a rolling window of latencies and outcomes."""
+    def __init__(self, window: int):
+        self.samples = deque(maxlen=window)  # (latency_ms, ok)
+        self.status = "unknown"
+        self.message = "Not probed yet"
+        self.detail: Optional[Dict[str, Any]] = None
+        self.checked_at: Optional[float] = None
+        self.probes = 0
+        self.failures = 0
+
+    def record(self, latency_ms: float, ok: bool, status: str, message: str, detail=None):
+        self.samples.append((latency_ms, ok))
+        self.status, self.message, self.detail = status, message, detail
+        self.checked_at = time.time()
+        self.probes += 1
+        self.failures += 0 if ok else 1
+
+    def to_dict(self, ttl: float) -> Dict[str, Any]:
+        latencies = np.array([latency for latency, _ in self.samples]) if self.samples else None
+        p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) if latencies is not None else (None,) * 3
+        age = time.time() - self.checked_at if self.checked_at else None
+        return {
+            "status": self.status,
+            "message": self.message,
+            "checked_at": self.checked_at,
+            "age_seconds": round(age, 1) if age is not None else None,
+            "stale": age is None or age > ttl,
+            "latency_ms": {
+                "last": round(self.samples[-1][0], 3) if self.samples else None,
+                "p50": round(float(p50), 3) if p50 is not None else None,
+                "p95": round(float(p95), 3) if p95 is not None else None,
+                "p99": round(float(p99), 3) if p99 is not None else None
+            },
+            "error_rate": round(sum(1 for _, ok in self.samples if not ok) / len(self.samples), 4) if self.samples else None,
+            "window": len(self.samples),
+            "probes": self.probes,
+            "failures": self.failures
+        }
+
+
+class HealthMonitor:
+    """
+    Probes the LLM and the vector store in a background task every
+    STATUS_PROBE_INTERVAL_SECONDS and keeps the results, so /api/status reads cached
+    state instead of calling Gemini per request. Results older than
+    STATUS_PROBE_TTL_SECONDS are reported as stale; latency percentiles and error
+    rates cover the last STATUS_PROBE_WINDOW probes.
+    """
+    def __init__(self, llm, rag, interval: float = None, ttl: float = None, window: int = None):
+        self.llm = llm
+        self.rag = rag
+        self.interval = interval or float(os.getenv("STATUS_PROBE_INTERVAL_SECONDS", "60"))
+        self.ttl = ttl or float(os.getenv("STATUS_PROBE_TTL_SECONDS", str(self.interval * 3)))
+        self.timeout = float(os.getenv("STATUS_PROBE_TIMEOUT_SECONDS", "15"))
+        window = window or int(os.getenv("STATUS_PROBE_WINDOW", "100"))
+        self.states = {"gemini": ProbeState(window), "vector_store": ProbeState(window)}
+        if not llm.model:
+            self.states["gemini"].status, self.states["gemini"].message = "disconnected", "API key not configured"
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            await self.probe_all()
+            await asyncio.sleep(self.interval)
+
+    async def probe_all(self):
+        await asyncio.gather(self._probe("gemini", self._probe_llm), self._probe("vector_store", self._probe_rag))
+
+    async def _probe(self, name: str, probe: Callable[[], Awaitable[tuple]]):
+        started = time.perf_counter()
+        try:
+            ok, status, message, detail = await asyncio.wait_for(probe(), self.timeout)
+        except asyncio.TimeoutError:
+            ok, status, message, detail = False, "error", f"Probe timed out after {self.timeout}s", None
+        except Exception as e:
+            ok, status, message, detail = False, "error", str(e), None
+        latency_ms = (time.perf_counter() - started) * 1000
+        if status == "disconnected":
+            # Nothing was called; keep the latency window for real probes
+            state = self.states[name]
+            state.status, state.message, state.checked_at = status, message, time.time()
+            return
+        self.states[name].record(latency_ms, ok, status, message, detail)
+        if not ok:
+            print(f"[Health] {name} probe failed: {message}")
+
+    async def _probe_llm(self):
+        if not self.llm.model:
+            return True, "disconnected", "API key not configured", None
+        response = await self.llm.complete(
+            "Say 'OK' if you are working.", use_cache=False, priority="background", agent="status"
+        )
+        if response:
+            return True, "connected", "Gemini API is operational", None
+        return False, "error", "Empty response from Gemini", None
+
+    async def _probe_rag(self):
+        stats = await asyncio.to_thread(self.rag.get_stats)
+        return True, "connected", f"{stats['type']} knowledge base reachable", stats
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {name: state.to_dict(self.ttl) for name, state in self.states.items()}
@@ -0,0 +1,182 @@
+import os
+import time
+import asyncio
+import hashlib
+import tempfile
+from functools import partial
+from typing import List, Dict, Any, Tuple, AsyncIterator
+
+# Default per-stage concurrency; LLM summarization is the slowest, I/O-bound stage
+STAGE_DEFAULTS = {"extract": 4, "mine": 4, "summarize": 8, "index": 2}
+SPOOL_CHUNK_BYTES = 1024 * 1024
+
+
+class IngestPipeline:
+    """
+    Staged document ingest: extract -> mine obligations -> summarize -> index.
+    Uploads are spooled to disk and read page by page; each page flows through
+    obligation mining and indexing before the next is extracted, so memory stays
+    bounded. Each stage has its own concurrency limit, so files overlap across
+    stages and results are yielded as soon as each file finishes.
+    """
+    def __init__(self, reader, scout, rag):
+        self.reader = reader
+        self.scout = scout
+        self.rag = rag
+        self.spool_dir = os.getenv("UPLOAD_SPOOL_DIR") or None
+        self.limits = {
+            stage: asyncio.Semaphore(int(os.getenv(f"INGEST_{stage.upper()}_CONCURRENCY", str(default))))
+            for stage, default in STAGE_DEFAULTS.items()
+        }
+
+    async def spool(self, upload) -> Tuple[str, str]:
+        """
+        Stream an UploadFile to a temporary file, hashing it on the way.
+        Returns (path, doc_id).
+        """
+        suffix = os.path.splitext(upload.filename or "")[1]
+        fd, path = tempfile.mkstemp(suffix=suffix, dir=self.spool_dir)
+        digest = hashlib.sha256()
+        try:
+            with os.fdopen(fd, "wb") as f:
+                while True:
+                    block = await upload.read(SPOOL_CHUNK_BYTES)
+                    if not block:
+                        break
+                    digest.update(block)
+                    f.write(block)
+        except BaseException:
+            os.remove(path)
+            raise
+        return path, self.rag.digest_id(digest.hexdigest())
+
+    async def _stage(self, name: str, timings: Dict[str, float], fn, *args):
+        """Run one stage step under its semaphore, accumulating time spent (excluding queueing)."""
+        async with self.limits[name]:
+            started = time.perf_counter()
+            try:
+                if _is_async(fn):
+                    return await fn(*args)
+                # CPU-bound steps run off the event loop
+                return await asyncio.to_thread(fn, *args)
+            finally:
+                _record(timings, name, started)
+
+    async def process(self, index: int, filename: str, path: str, doc_id: str) -> Dict[str, Any]:
+        # Extract client/document name from filename
+        client_name = filename.rsplit('.', 1)[0]  # Remove extension
+        self.scout.set_current_client(client_name)
+        result = {"index": index, "filename": filename, "client": client_name, "doc_id": doc_id}
+        timings: Dict[str, float] = {}
+        stage = "extract"
+        pages = None
+        writer = None
+
+        try:
+            # Identical bytes were already indexed: skip extraction and embedding
+            if self.rag.is_indexed(doc_id):
+                return {**result, "status": "unchanged", "timings": timings}
+
+            separator = self.reader.page_separator(filename)
+            obligations = self.scout.open_obligation_stream(filename)
+            writer = self.rag.open_document(doc_id, {"type": "regulation", "title": filename}, separator)
+            self.scout.log_activity("Indexing knowledge into Vector DB...")
+            chars = 0
+            pages = self.reader.iter_pages_async(path, filename).__aiter__()
+
+            while True:
+                stage = "extract"
+                item = await self._next_page(pages, timings)
+                if item is None:
+                    break
+                page_number, text = item
+                chars += len(text) + (len(separator) if chars else 0)
+                stage = "mine"
+                await self._stage("mine", timings, obligations.feed, text + separator)
+                stage = "index"
+                await self._stage("index", timings, partial(writer.add_page, text, page_number, kind="raw"))
+
+            stage = "mine"
+            found = await self._stage("mine", timings, obligations.close)
+            self.scout.log_activity(f"Extracted {len(found)} obligations.")
+            stage = "summarize"
+            analysis = await self._stage("summarize", timings, self.scout.think, {"obligations": found})
+            stage = "index"
+            await self._stage("index", timings, partial(writer.add_page, analysis, 0, kind="summary"))
+            await self._stage("index", timings, writer.close)
+        except Exception as e:
+            if writer is not None:
+                # Don't leave a half-indexed document behind to be served by queries
+                await writer.abort()
+            return {**result, "status": "error", "stage": stage, "error": str(e), "timings": timings}
+        finally:
+            if pages is not None:
+                await pages.aclose()
+            _remove_quietly(path)
+
+        return {
+            **result,
+            "chars_extracted": chars,
+            "status": "processed",
+            "processing_result": {
+                "status": "indexed",
+                "doc_id": doc_id,
+                "chunks": writer.chunk_count,
+                "summary": analysis
+            },
+            "timings": timings
+        }
+
+    async def _next_page(self, pages, timings: Dict[str, float]):
+        """Pull the next page from the reader, timed as the extract stage."""
+        async with self.limits["extract"]:
+            started = time.perf_counter()
+            try:
+                return await pages.__anext__()
+            except StopAsyncIteration:
+                return None
+            finally:
+                _record(timings, "extract", started)
+
+    async def run(self, uploads: List[Tuple[str, str, str]]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Process spooled (filename, path, doc_id) uploads concurrently, yielding
+        results in completion order. Spool files are removed when done.
+        """
+        tasks = [
+            asyncio.create_task(self.process(i, filename, path, doc_id))
+            for i, (filename, path, doc_id) in enumerate(uploads)
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+            for _, path, _ in uploads:
+                _remove_quietly(path)
+
+    @staticmethod
+    def summarize_timings(results: List[Dict[str, Any]]) -> Dict[str, float]:
+        """Total time spent in each stage across all files."""
+        totals: Dict[str, float] = {}
+        for result in results:
+            for key, value in result.get("timings", {}).items():
+                totals[key] = round(totals.get(key, 0.0) + value, 3)
+        return totals
+
+
+def _is_async(fn) -> bool:
+    return asyncio.iscoroutinefunction(fn.func if isinstance(fn, partial) else fn)
+
+
+def _record(timings: Dict[str, float], stage: str, started: float):
+    key = f"{stage}_ms"
+    timings[key] = round(timings.get(key, 0.0) + (time.perf_counter() - started) * 1000, 3)
+
+
+def _remove_quietly(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,163 @@
+import re
+import math
+import threading
+from collections import Counter
+from typing import List, Dict, Tuple
+
+import numpy as np
+
+# Words plus dotted identifiers such as "3.2" or "5.1.4"
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:\.[0-9]+)*")
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class BM25Index:
+    """
+    Incremental in-process BM25 index.
+    Postings are kept per term and materialized as NumPy arrays for scoring.
+    Safe to share between the event loop and worker threads: add, remove and search
+    each hold the index lock. Removed documents leave dead slots that are masked at
+    query time; once they outnumber compact_ratio of the live ones the index is compacted.
+    """
+    def __init__(self, k1: float = 1.5, b: float = 0.75, compact_ratio: float = 0.5, min_compact: int = 64):
+        self.k1 = k1
+        self.b = b
+        self.compact_ratio = compact_ratio
+        self.min_compact = min_compact
+        self._keys: List[str] = []
+        self._slots: Dict[str, int] = {}  # key -> slot
+        self._doc_len = np.zeros(1024, dtype=np.float32)
+        self._alive = np.zeros(1024, dtype=bool)
+        self._doc_terms: List[List[str]] = []
+        self._postings: Dict[str, Tuple[List[int], List[int]]] = {}  # term -> (slots, term frequencies)
+        self._arrays: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}  # materialized postings cache
+        self._df: Counter = Counter()
+        self._total_len = 0
+        self._live = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._live
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._slots
+
+    def add(self, key: str, text: str):
+        """Index text under key, replacing any previous text for that key."""
+        tokens = tokenize(text)
+        counts = Counter(tokens)
+        with self._lock:
+            self._add(key, tokens, counts)
+
+    def _add(self, key: str, tokens: List[str], counts: Counter):
+        if key in self._slots:
+            self._remove(key)
+        slot = len(self._keys)
+        if slot >= len(self._doc_len):
+            self._doc_len = np.resize(self._doc_len, slot * 2)
+            self._alive = np.concatenate([self._alive, np.zeros(slot, dtype=bool)])
+
+        self._keys.append(key)
+        self._slots[key] = slot
+        self._doc_terms.append(list(counts))
+        self._doc_len[slot] = len(tokens)
+        self._alive[slot] = True
+        self._total_len += len(tokens)
+        self._live += 1
+
+        for term, tf in counts.items():
+            slots, tfs = self._postings.setdefault(term, ([], []))
+            slots.append(slot)
+            tfs.append(tf)
+            self._df[term] += 1
+            self._arrays.pop(term, None)
+
+    def remove(self, key: str):
+        with self._lock:
+            self._remove(key)
+
+    def _remove(self, key: str):
+        slot = self._slots.pop(key, None)
+        if slot is None:
+            return
+        # Postings keep the dead slot; it is masked out at query time
+        self._alive[slot] = False
+        self._total_len -= int(self._doc_len[slot])
+        self._live -= 1
+        for term in self._doc_terms[slot]:
+            self._df[term] -= 1
+        self._doc_terms[slot] = []
+        dead = len(self._keys) - self._live
+        if dead >= self.min_compact and dead > self._live * self.compact_ratio:
+            self._compact()
+
+    def _compact(self):
+        """Drop dead slots: renumber live documents and rewrite postings without them."""
+        remap = [-1] * len(self._keys)
+        keys, doc_terms = [], []
+        for slot, key in enumerate(self._keys):
+            if self._alive[slot]:
+                remap[slot] = len(keys)
+                keys.append(key)
+                doc_terms.append(self._doc_terms[slot])
+        live = np.flatnonzero(self._alive[:len(self._keys)])
+        capacity = max(1024, len(keys) * 2)
+        doc_len = np.zeros(capacity, dtype=np.float32)
+        doc_len[:len(keys)] = self._doc_len[live]
+        alive = np.zeros(capacity, dtype=bool)
+        alive[:len(keys)] = True
+
+        postings = {}
+        for term, (slots, tfs) in self._postings.items():
+            kept = [(remap[s], tf) for s, tf in zip(slots, tfs) if remap[s] >= 0]
+            if kept:
+                postings[term] = ([s for s, _ in kept], [tf for _, tf in kept])
+        self._keys, self._doc_terms = keys, doc_terms
+        self._slots = {key: slot for slot, key in enumerate(keys)}
+        self._doc_len, self._alive = doc_len, alive
+        self._postings = postings
+        self._df = Counter({term: df for term, df in self._df.items() if df > 0})
+        self._arrays = {}
+
+    def _term_arrays(self, term: str) -> Tuple[np.ndarray, np.ndarray]:
+        arrays = self._arrays.get(term)
+        if arrays is None:
+            slots, tfs = self._postings[term]
+            arrays = (np.asarray(slots, dtype=np.int64), np.asarray(tfs, dtype=np.float32))
+            self._arrays[term] = arrays
+        return arrays
+
+    def search(self, query: str, top_k: int = 3) -> List[Tuple[str, float]]:
+        """Return up to top_k (key, score) pairs, best first."""
+        terms = set(tokenize(query))
+        with self._lock:
+            return self._search(terms, top_k)
+
+    def _search(self, terms, top_k: int) -> List[Tuple[str, float]]:
+        if not self._live:
+            return []
+        n_slots = len(self._keys)
+        scores = np.zeros(n_slots, dtype=np.float32)
+        avgdl = self._total_len / self._live or 1.0
+        norm = self.k1 * (1 - self.b + self.b * self._doc_len[:n_slots] / avgdl)
+
+        matched = False
+        for term in terms:
+            df = self._df.get(term, 0)
+            if df <= 0:
+                continue
+            matched = True
+            idf = math.log(1 + (self._live - df + 0.5) / (df + 0.5))
+            slots, tfs = self._term_arrays(term)
+            scores[slots] += idf * tfs * (self.k1 + 1) / (tfs + norm[slots])
+
+        if not matched:
+            return []
+        scores[~self._alive[:n_slots]] = 0
+        k = min(top_k, n_slots)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(self._keys[i], float(scores[i])) for i in top if scores[i] > 0]
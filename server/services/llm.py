@@ -1,7 +1,13 @@
 import os
 import json
+import random
+import asyncio
+from contextvars import ContextVar
 from typing import Dict, Any
 from dotenv import load_dotenv
+from services.cache import TieredCache
+from services.rate_limiter import RateLimiter
+from tools.context_packer import count_tokens
 
 load_dotenv()
 
@@ -11,40 +17,159 @@ try:
 except ImportError:
     GEMINI_AVAILABLE = False
 
+# Priority class for LLM calls made in the current task; batch jobs set "batch"
+LLM_PRIORITY: ContextVar = ContextVar("llm_priority", default="interactive")
+
+# Provider errors worth retrying (rate limits and transient server errors)
+RETRYABLE_ERRORS = ("ResourceExhausted", "TooManyRequests", "ServiceUnavailable", "InternalServerError",
+                    "DeadlineExceeded", "Aborted")
+USAGE_COUNTERS = ("requests", "cache_hits", "mock", "prompt_tokens", "completion_tokens", "retries",
+                  "rate_limited", "wait_seconds", "errors", "fallbacks")
+
+
+class LLMUnavailableError(RuntimeError):
+    """The provider kept failing after all retries and mock fallback is disabled."""
+
+
+def _rounded(counters: Dict[str, float]) -> Dict[str, float]:
+    return {**counters, "wait_seconds": round(counters["wait_seconds"], 3)}
+
+
+def _is_retryable(error: Exception) -> bool:
+    code = getattr(error, "code", None)
+    return type(error).__name__ in RETRYABLE_ERRORS or code in (429, 500, 503) or "429" in str(error)
+
 
 class LLMService:
     """
     Production LLM Service using Google Gemini API.
-    Falls back to mock responses if API key is not configured.
+    Calls are non-blocking, bounded by a global concurrency limit and a per-call timeout,
+    and paced by a shared requests/min and tokens/min limiter with priority classes.
+    Rate-limited and transient failures are retried with jittered exponential backoff.
+    Falls back to mock responses if API key is not configured; with a key, failures raise
+    LLMUnavailableError unless LLM_MOCK_ON_ERROR=true.
     """
     def __init__(self):
         self.api_key = os.getenv("GEMINI_API_KEY")
         self.model = None
+        self.model_name = os.getenv("LLM_MODEL", "gemini-2.0-flash")
+        self.timeout = float(os.getenv("LLM_TIMEOUT_SECONDS", "60"))
+        self.max_concurrency = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.in_flight = 0
+        self.limiter = RateLimiter()
+        self.max_retries = int(os.getenv("LLM_MAX_RETRIES", "3"))
+        self.retry_base = float(os.getenv("LLM_RETRY_BASE_SECONDS", "1"))
+        self.retry_max = float(os.getenv("LLM_RETRY_MAX_SECONDS", "30"))
+        self.expected_output_tokens = int(os.getenv("LLM_EXPECTED_OUTPUT_TOKENS", "256"))
+        self.mock_on_error = os.getenv("LLM_MOCK_ON_ERROR", "false").lower() == "true"
+        self.usage: Dict[str, Dict[str, float]] = {}
+        self.cache = None
+        if os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true":
+            self.cache = TieredCache(
+                path=os.getenv("LLM_CACHE_PATH", "./cache/llm_cache.sqlite3"),
+                table="llm_responses",
+                memory_entries=int(os.getenv("LLM_CACHE_MEMORY_ENTRIES", "512")),
+                disk_entries=int(os.getenv("LLM_CACHE_DISK_ENTRIES", "10000")),
+                ttl_seconds=float(os.getenv("LLM_CACHE_TTL_SECONDS", "86400"))
+            )
         
         if GEMINI_AVAILABLE and self.api_key and self.api_key != "your_gemini_api_key_here":
             genai.configure(api_key=self.api_key)
-            self.model = genai.GenerativeModel("gemini-2.0-flash")
+            self.model = genai.GenerativeModel(self.model_name)
             print("[LLM] Gemini API initialized successfully")
         else:
             print("[LLM] Running in MOCK mode (no API key or genai not installed)")
 
-    async def complete(self, prompt: str, context: str = "") -> str:
+    def _count(self, agent: str, **deltas):
+        counters = self.usage.setdefault(agent or "unattributed", dict.fromkeys(USAGE_COUNTERS, 0))
+        for key, value in deltas.items():
+            counters[key] += value
+
+    async def _generate(self, prompt: str, timeout: float = None, use_cache: bool = True,
+                        priority: str = None, agent: str = None) -> str:
+        """
+        Run one Gemini call on the async client under the rate and concurrency limits.
+        Responses are cached by model and whitespace-normalized prompt; cache hits skip the limiter.
+        Raises asyncio.TimeoutError once the timeout expires; the request is cancelled.
+        """
+        cache_key = None
+        if self.cache and use_cache:
+            cache_key = TieredCache.make_key(self.model_name, " ".join(prompt.split()))
+            # SQLite-backed; keep its reads and writes off the event loop
+            cached = await asyncio.to_thread(self.cache.get, cache_key)
+            if cached is not None:
+                self._count(agent, cache_hits=1)
+                return cached.decode("utf-8")
+
+        estimated = count_tokens(prompt) + self.expected_output_tokens
+        for attempt in range(self.max_retries + 1):
+            waited = await self.limiter.acquire(estimated, priority or LLM_PRIORITY.get())
+            self._count(agent, requests=1, wait_seconds=waited, rate_limited=int(waited > 0.001))
+            try:
+                async with self._semaphore:
+                    self.in_flight += 1
+                    try:
+                        response = await asyncio.wait_for(
+                            self.model.generate_content_async(prompt),
+                            timeout=timeout or self.timeout
+                        )
+                    finally:
+                        self.in_flight -= 1
+                break
+            except Exception as e:
+                if isinstance(e, asyncio.TimeoutError) or not _is_retryable(e) or attempt == self.max_retries:
+                    self._count(agent, errors=1)
+                    raise
+                # Full jitter keeps retrying callers from hitting the provider in lockstep
+                backoff = random.uniform(0, min(self.retry_max, self.retry_base * 2 ** attempt))
+                self._count(agent, retries=1)
+                print(f"[LLM] {type(e).__name__}, retry {attempt + 1}/{self.max_retries} in {backoff:.1f}s")
+                await asyncio.sleep(backoff)
+
+        text = response.text
+        usage = getattr(response, "usage_metadata", None)
+        prompt_tokens = getattr(usage, "prompt_token_count", None) or count_tokens(prompt)
+        completion_tokens = getattr(usage, "candidates_token_count", None) or count_tokens(text)
+        self.limiter.reconcile(estimated, prompt_tokens + completion_tokens)
+        self._count(agent, prompt_tokens=prompt_tokens, completion_tokens=completion_tokens)
+
+        if cache_key:
+            await asyncio.to_thread(self.cache.set, cache_key, text.encode("utf-8"))
+        return text
+
+    def _fallback(self, agent: str, error: Exception, mock):
+        """Mock output after a failed call, only if LLM_MOCK_ON_ERROR allows it."""
+        if not self.mock_on_error:
+            raise LLMUnavailableError(f"{type(error).__name__}: {error}") from error
+        self._count(agent, fallbacks=1)
+        return mock
+
+    async def complete(self, prompt: str, context: str = "", timeout: float = None,
+                       use_cache: bool = True, priority: str = None, agent: str = None) -> str:
         """
         Generate a completion using Gemini or mock.
+        Pass use_cache=False when a fresh response is required. priority is
+        "interactive", "batch" or "background" (default: the task's LLM_PRIORITY);
+        agent attributes the call in the usage counters.
         """
         full_prompt = f"{context}\n\n{prompt}" if context else prompt
         
         if self.model:
             try:
-                response = self.model.generate_content(full_prompt)
-                return response.text
+                return await self._generate(full_prompt, timeout, use_cache, priority, agent)
+            except asyncio.TimeoutError as e:
+                print(f"[LLM] API Timeout after {timeout or self.timeout}s")
+                return self._fallback(agent, e, self._mock_response(prompt))
             except Exception as e:
                 print(f"[LLM] API Error: {e}")
-                return self._mock_response(prompt)
+                return self._fallback(agent, e, self._mock_response(prompt))
         else:
+            self._count(agent, mock=1, prompt_tokens=count_tokens(full_prompt))
             return self._mock_response(prompt)
 
-    async def extract_structured(self, text: str, schema: dict) -> Dict[str, Any]:
+    async def extract_structured(self, text: str, schema: dict, timeout: float = None,
+                                 priority: str = None, agent: str = None) -> Dict[str, Any]:
         """
         Extract structured JSON from text using Gemini.
         """
@@ -58,20 +183,46 @@ Return ONLY valid JSON, no markdown formatting."""
 
         if self.model:
             try:
-                response = self.model.generate_content(prompt)
+                response_text = await self._generate(prompt, timeout, priority=priority, agent=agent)
                 # Clean and parse JSON
-                json_str = response.text.strip()
+                json_str = response_text.strip()
                 if json_str.startswith("```"):
                     json_str = json_str.split("```")[1]
                     if json_str.startswith("json"):
                         json_str = json_str[4:]
                 return json.loads(json_str)
+            except asyncio.TimeoutError as e:
+                print(f"[LLM] Extraction Timeout after {timeout or self.timeout}s")
+                return self._fallback(agent, e, self._mock_extraction())
+            except json.JSONDecodeError as e:
+                print(f"[LLM] Extraction Error: {e}")
+                return self._fallback(agent, e, self._mock_extraction())
             except Exception as e:
                 print(f"[LLM] Extraction Error: {e}")
-                return self._mock_extraction()
+                return self._fallback(agent, e, self._mock_extraction())
         else:
+            self._count(agent, mock=1, prompt_tokens=count_tokens(prompt))
             return self._mock_extraction()
 
+    def get_usage(self) -> Dict[str, Any]:
+        """Per-agent call, token, retry and wait counters plus the limiter state."""
+        totals = dict.fromkeys(USAGE_COUNTERS, 0)
+        for counters in self.usage.values():
+            for key, value in counters.items():
+                totals[key] += value
+        return {
+            "agents": {agent: _rounded(c) for agent, c in self.usage.items()},
+            "totals": _rounded(totals),
+            "limits": self.limiter.get_stats(),
+            "in_flight": self.in_flight
+        }
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Hit/miss statistics for the response cache."""
+        if not self.cache:
+            return {"enabled": False}
+        return {"enabled": True, **self.cache.get_stats()}
+
     def _mock_response(self, prompt: str) -> str:
         """Fallback mock responses for development."""
         if "analyze" in prompt.lower() and "policy" in prompt.lower():
@@ -0,0 +1,86 @@
+import os
+import time
+import threading
+from collections import deque
+from typing import Dict, Any, List
+
+# Counters kept for every finding; "findings" is the total number of gaps reported
+COUNTERS = ("findings", "critical", "high", "medium", "low", "pending_reviews", "remediated")
+
+
+def finding_counters(severity: str, status: str) -> Dict[str, int]:
+    """Counter increments for one finding."""
+    deltas = dict.fromkeys(COUNTERS, 0)
+    deltas["findings"] = 1
+    level = (severity or "").lower()
+    if level in deltas:
+        deltas[level] = 1
+    if status == "Pending Manual Review":
+        deltas["pending_reviews"] = 1
+    elif status == "Remediated":
+        deltas["remediated"] = 1
+    return deltas
+
+
+def compliance_score(counters: Dict[str, int]) -> int:
+    """
+    Start at 100 (no gaps) and deduct per finding:
+    Critical = -15 points, High = -10 points, other gaps = -5 points.
+    """
+    critical, high = counters["critical"], counters["high"]
+    others = max(0, counters["findings"] - critical - high)
+    return max(0, 100 - (critical * 15 + high * 10 + others * 5))
+
+
+class ComplianceMetrics:
+    """
+    Running dashboard counters, updated as each finding is recorded so reads are O(1).
+    Per-interval deltas are kept in fixed-width time buckets for trend charts.
+    """
+    def __init__(self, bucket_seconds: float = None, retention: int = None):
+        self.bucket_seconds = bucket_seconds or float(os.getenv("METRICS_BUCKET_SECONDS", "60"))
+        self.retention = retention or int(os.getenv("METRICS_RETENTION_BUCKETS", "1440"))
+        self.totals: Dict[str, int] = dict.fromkeys(COUNTERS, 0)
+        self._buckets = deque(maxlen=self.retention)  # (bucket_start, deltas, totals at bucket end)
+        self._lock = threading.Lock()
+
+    def record_finding(self, severity: str, status: str, at: float = None):
+        """Count one finding from GapAnalyst.act."""
+        deltas = finding_counters(severity, status)
+        start = ((at or time.time()) // self.bucket_seconds) * self.bucket_seconds
+        with self._lock:
+            for key, value in deltas.items():
+                self.totals[key] += value
+            if not self._buckets or self._buckets[-1][0] != start:
+                self._buckets.append((start, dict.fromkeys(COUNTERS, 0), None))
+            bucket_start, bucket_deltas, _ = self._buckets[-1]
+            for key, value in deltas.items():
+                bucket_deltas[key] += value
+            self._buckets[-1] = (bucket_start, bucket_deltas, dict(self.totals))
+
+    def seed(self, totals: Dict[str, int]):
+        """Start the running totals from persisted counts (e.g. after a restart)."""
+        with self._lock:
+            self.totals = {key: totals.get(key, 0) for key in COUNTERS}
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.totals)
+
+    def series(self, limit: int = None) -> List[Dict[str, Any]]:
+        """
+        Buckets that saw findings, oldest first: per-bucket deltas plus running
+        totals and the score they imply.
+        """
+        with self._lock:
+            buckets = list(self._buckets)[-limit:] if limit else list(self._buckets)
+        return [
+            {
+                "timestamp": start,
+                "bucket_seconds": self.bucket_seconds,
+                "deltas": deltas,
+                "totals": totals,
+                "score": compliance_score(totals)
+            }
+            for start, deltas, totals in buckets
+        ]
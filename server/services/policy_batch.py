@@ -0,0 +1,105 @@
+import os
+import time
+import asyncio
+from typing import List, Dict, Any, AsyncIterator
+
+from services.llm import LLM_PRIORITY
+
+
+class PolicyBatch:
+    """
+    Gap analysis for many policies at once (e.g. onboarding a client).
+    Policies run concurrently up to POLICY_BATCH_CONCURRENCY; the LLM service applies
+    its own limit on top. RAG lookups are shared: policy sections with the same text
+    (after whitespace normalization) wait on one query instead of issuing their own.
+    Findings are collected and written to the store in bulk, POLICY_BATCH_WRITE_SIZE
+    rows per INSERT. Results are yielded in completion order.
+    """
+    def __init__(self, analyst, concurrency: int = None):
+        self.analyst = analyst
+        self.concurrency = concurrency or int(os.getenv("POLICY_BATCH_CONCURRENCY", "8"))
+        self.write_size = int(os.getenv("POLICY_BATCH_WRITE_SIZE", "200"))
+        self._lookups: Dict[str, asyncio.Task] = {}
+        self._rows: List[Dict[str, Any]] = []  # findings not yet written
+        self.findings_written = 0
+        self.store_writes = 0
+        self.rag_queries = 0
+        self.rag_shared = 0
+        self.completed = 0
+        self.failed = 0
+        self.started = None
+
+    async def _regulations(self, policy_text: str) -> list:
+        key = " ".join(policy_text.split())
+        lookup = self._lookups.get(key)
+        if lookup is None:
+            self.rag_queries += 1
+            lookup = self._lookups[key] = asyncio.create_task(self.analyst.retrieve(policy_text))
+        else:
+            self.rag_shared += 1
+        # shield: one cancelled policy must not cancel a lookup others are waiting on
+        return await asyncio.shield(lookup)
+
+    async def _analyze(self, index: int, policy_text: str, client_name: str, limit: asyncio.Semaphore):
+        async with limit:
+            started = time.perf_counter()
+            self.analyst.set_current_client(client_name)
+            LLM_PRIORITY.set("batch")  # task-local: queue behind interactive analysis
+            result = {"index": index, "client": client_name}
+            try:
+                analysis = await self.analyst.analyze_policy(policy_text, self._regulations, self._record)
+                self.completed += 1
+                result.update(status="analyzed", analysis=analysis)
+            except Exception as e:
+                self.failed += 1
+                result.update(status="error", error=str(e))
+            result["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 3)
+            return result
+
+    async def run(self, policies: List[str], client_name: str) -> AsyncIterator[Dict[str, Any]]:
+        self.started = time.perf_counter()
+        limit = asyncio.Semaphore(self.concurrency)
+        tasks = [
+            asyncio.create_task(self._analyze(i, text, client_name, limit))
+            for i, text in enumerate(policies)
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                result = await next_done
+                if len(self._rows) >= self.write_size:
+                    await self._flush()
+                yield result
+        finally:
+            for task in tasks + list(self._lookups.values()):
+                task.cancel()
+            # Findings of policies that finished are kept even if the batch is cut short
+            await self._flush()
+
+    def _record(self, row: Dict[str, Any]):
+        self._rows.append(row)
+
+    async def _flush(self):
+        rows, self._rows = self._rows, []
+        store = self.analyst.store
+        if not rows or store is None:
+            return
+        try:
+            self.findings_written += await asyncio.to_thread(store.add_findings, rows)
+            self.store_writes += 1
+        except Exception as e:
+            print(f"[PolicyBatch] Failed to store {len(rows)} findings: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        wall = time.perf_counter() - self.started if self.started else 0.0
+        done = self.completed + self.failed
+        return {
+            "policies_analyzed": self.completed,
+            "errors": self.failed,
+            "rag_queries": self.rag_queries,
+            "rag_lookups_shared": self.rag_shared,
+            "findings_written": self.findings_written,
+            "store_writes": self.store_writes,
+            "concurrency": self.concurrency,
+            "wall_ms": round(wall * 1000, 3),
+            "policies_per_sec": round(done / wall, 2) if wall > 0 else 0.0
+        }
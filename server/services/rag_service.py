@@ -1,6 +1,14 @@
 import os
-from typing import List, Dict, Any
+import time
+import asyncio
+import hashlib
+import threading
+from array import array
+from typing import List, Dict, Any, Optional, Union, Tuple
 from dotenv import load_dotenv
+from tools.chunker import DocumentChunker
+from services.cache import TieredCache
+from services.lexical_index import BM25Index
 
 load_dotenv()
 
@@ -17,16 +25,41 @@ try:
 except ImportError:
     GEMINI_AVAILABLE = False
 
+RETRIEVAL_MODES = ("hybrid", "vector", "lexical")
+
 
 class RAGService:
     """
     Production RAG Service using ChromaDB for vector storage.
-    Falls back to in-memory list if ChromaDB is not available.
+    A BM25 lexical index runs alongside it for hybrid retrieval.
+    Falls back to in-memory BM25 search if ChromaDB is not available.
+    Chunks are written from worker threads; changes to the in-memory knowledge base
+    and the lexical index are made together under one lock.
     """
     def __init__(self):
-        self.knowledge_base: List[Dict] = []  # Fallback
+        self.knowledge_base: Dict[str, Dict] = {}  # Fallback, keyed by chunk id
+        self.lexical_index = BM25Index()
+        self._index_lock = threading.Lock()  # guards knowledge_base + lexical_index changes
         self.collection = None
         self.embedding_model = None
+        self.indexed_ids: set = set()  # doc_ids currently in the knowledge base
+        self.chunker = DocumentChunker(
+            chunk_size=int(os.getenv("RAG_CHUNK_SIZE", "1200")),
+            chunk_overlap=int(os.getenv("RAG_CHUNK_OVERLAP", "200"))
+        )
+        self.embed_batch_size = int(os.getenv("RAG_EMBED_BATCH_SIZE", "100"))
+        self.write_batch_size = int(os.getenv("RAG_WRITE_BATCH_SIZE", "1000"))
+        self.retrieval_mode = os.getenv("RAG_RETRIEVAL_MODE", "hybrid")  # hybrid | vector | lexical
+        self.rrf_k = int(os.getenv("RAG_RRF_K", "60"))
+        self.retrieval_timings = {"vector": [0, 0.0], "lexical": [0, 0.0]}  # leg -> [calls, total ms]
+        self.embedding_cache = None
+        if os.getenv("EMBEDDING_CACHE_ENABLED", "true").lower() == "true":
+            self.embedding_cache = TieredCache(
+                path=os.getenv("EMBEDDING_CACHE_PATH", "./cache/embedding_cache.sqlite3"),
+                table="embeddings",
+                memory_entries=int(os.getenv("EMBEDDING_CACHE_MEMORY_ENTRIES", "2048")),
+                disk_entries=int(os.getenv("EMBEDDING_CACHE_DISK_ENTRIES", "200000"))
+            )
         
         # Initialize Gemini for embeddings
         api_key = os.getenv("GEMINI_API_KEY")
@@ -43,101 +76,405 @@ class RAGService:
                     name="compliance_knowledge",
                     metadata={"hnsw:space": "cosine"}
                 )
-                print(f"[RAG] ChromaDB initialized with {self.collection.count()} documents")
+                self.indexed_ids = self._load_existing()
+                print(f"[RAG] ChromaDB initialized with {len(self.indexed_ids)} documents ({self.collection.count()} chunks)")
             except Exception as e:
                 print(f"[RAG] ChromaDB Error: {e}. Using in-memory fallback.")
         else:
             print("[RAG] ChromaDB not installed. Using in-memory fallback.")
 
-    def _get_embedding(self, text: str) -> List[float]:
-        """Generate embedding using Gemini or return None for default."""
-        if self.embedding_model:
-            try:
+    def _embedding_cache_key(self, text: str, task_type: str) -> str:
+        text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return TieredCache.make_key(self.embedding_model, task_type, text_hash)
+
+    def _get_embeddings(self, texts: List[str], task_type: str = "retrieval_document") -> Optional[List[List[float]]]:
+        """
+        Embed texts in batched calls, serving repeats from the embedding cache.
+        Returns None to fall back to the default embedder.
+        """
+        if not self.embedding_model or not texts:
+            return None
+        embeddings: List[Optional[List[float]]] = [None] * len(texts)
+        keys = [self._embedding_cache_key(t, task_type) for t in texts] if self.embedding_cache else []
+        for i, key in enumerate(keys):
+            cached = self.embedding_cache.get(key)
+            if cached is not None:
+                embeddings[i] = array("f", cached).tolist()
+
+        # Embed each distinct uncached text once
+        missing: Dict[str, List[int]] = {}
+        for i, e in enumerate(embeddings):
+            if e is None:
+                missing.setdefault(texts[i], []).append(i)
+        pending = list(missing)
+        try:
+            for start in range(0, len(pending), self.embed_batch_size):
+                batch = pending[start:start + self.embed_batch_size]
                 result = genai.embed_content(
                     model=self.embedding_model,
-                    content=text,
-                    task_type="retrieval_document"
+                    content=batch,
+                    task_type=task_type
                 )
-                return result['embedding']
-            except Exception as e:
-                print(f"[RAG] Embedding error: {e}")
-                return None
-        return None
+                for text, embedding in zip(batch, result['embedding']):
+                    for i in missing[text]:
+                        embeddings[i] = embedding
+                    if self.embedding_cache:
+                        # Stored as packed float32 rather than JSON
+                        self.embedding_cache.set(keys[missing[text][0]], array("f", embedding).tobytes())
+            return embeddings
+        except Exception as e:
+            print(f"[RAG] Embedding error: {e}")
+            return None
 
-    async def add_document(self, content: str, metadata: Dict[str, Any]):
+    def _get_embedding(self, text: str, task_type: str = "retrieval_document") -> Optional[List[float]]:
+        """Generate embedding using Gemini or return None for default."""
+        embeddings = self._get_embeddings([text], task_type)
+        return embeddings[0] if embeddings else None
+
+    @staticmethod
+    def content_id(content: Union[str, bytes]) -> str:
+        """Stable document ID derived from the document's content."""
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+        return RAGService.digest_id(hashlib.sha256(content).hexdigest())
+
+    @staticmethod
+    def digest_id(hexdigest: str) -> str:
+        """Document ID for a SHA-256 hex digest computed incrementally (e.g. while spooling)."""
+        return f"doc_{hexdigest[:32]}"
+
+    def is_indexed(self, doc_id: str) -> bool:
+        """Check whether a document ID is already in the knowledge base."""
+        return doc_id in self.indexed_ids
+
+    async def add_document(self, content: str, metadata: Dict[str, Any], page_breaks: List[int] = None,
+                           doc_id: str = None):
         """
-        Add a document to the knowledge base.
+        Chunk a document and upsert the chunks into the knowledge base.
+        page_breaks optionally holds the character offset at which each page starts.
+        doc_id defaults to a hash of the content; re-adding an ID replaces its chunks.
         """
-        doc_id = f"doc_{len(self.knowledge_base)}"
-        
+        doc_id = doc_id or self.content_id(content)
+        chunks = self.chunker.chunk(content, page_breaks)
+        if not chunks:
+            return
+
+        # Drop chunks left over from a longer previous version; embedding and the
+        # Chroma/SQLite writes block, so they run off the event loop
+        await asyncio.to_thread(self._remove_document, doc_id)
+        entries = [
+            (
+                f"{doc_id}_chunk_{c['index']}",
+                c["text"],
+                {**metadata, "doc_id": doc_id, "chunk_index": c["index"], "page": c["page"], "offset": c["start"]}
+            )
+            for c in chunks
+        ]
+        entries[-1][2]["complete"] = True  # written last: marks the document as fully indexed
+        await asyncio.to_thread(self._write_chunks, entries)
+        self.indexed_ids.add(doc_id)
+        self._log_indexed(metadata.get("title", doc_id), len(chunks))
+
+    def open_document(self, doc_id: str, metadata: Dict[str, Any], separator: str = "\n\n") -> "DocumentWriter":
+        """Start indexing a document incrementally, page by page."""
+        return DocumentWriter(self, doc_id, metadata, separator)
+
+    def _write_chunks(self, entries: List[Tuple[str, str, Dict[str, Any]]]):
+        """Embed and upsert (chunk_id, text, metadata) entries in bulk."""
+        ids = [e[0] for e in entries]
+        documents = [e[1] for e in entries]
+        metadatas = [e[2] for e in entries]
+
         if self.collection:
-            embedding = self._get_embedding(content)
-            if embedding:
-                self.collection.add(
-                    ids=[doc_id],
-                    embeddings=[embedding],
-                    documents=[content],
-                    metadatas=[metadata]
-                )
-            else:
-                # Use ChromaDB's default embedding if Gemini not available
-                self.collection.add(
-                    ids=[doc_id],
-                    documents=[content],
-                    metadatas=[metadata]
-                )
-            print(f"[RAG] Indexed document: {metadata.get('title', doc_id)}")
+            embeddings = self._get_embeddings(documents)
+            for i in range(0, len(ids), self.write_batch_size):
+                batch = slice(i, i + self.write_batch_size)
+                if embeddings:
+                    self.collection.upsert(
+                        ids=ids[batch],
+                        embeddings=embeddings[batch],
+                        documents=documents[batch],
+                        metadatas=metadatas[batch]
+                    )
+                else:
+                    # Use ChromaDB's default embedding if Gemini not available
+                    self.collection.upsert(
+                        ids=ids[batch],
+                        documents=documents[batch],
+                        metadatas=metadatas[batch]
+                    )
+        with self._index_lock:
+            if not self.collection:
+                # Fallback to in-memory
+                for chunk_id, document, meta in entries:
+                    self.knowledge_base[chunk_id] = {
+                        "id": chunk_id,
+                        "content": document,
+                        "meta": meta
+                    }
+            for chunk_id, document in zip(ids, documents):
+                self.lexical_index.add(chunk_id, document)
+
+    def _remove_document(self, doc_id: str, registered_only: bool = True):
+        """
+        Delete every chunk of doc_id. With registered_only=False this also clears chunks of
+        a document whose indexing never completed (and so was never registered).
+        """
+        if registered_only and doc_id not in self.indexed_ids:
+            return
+        # Lexical postings go first, so searches stop returning the chunks before they disappear
+        if self.collection:
+            stale = self.collection.get(where={"doc_id": doc_id}, include=[])["ids"]
+            with self._index_lock:
+                for chunk_id in stale:
+                    self.lexical_index.remove(chunk_id)
+                self.indexed_ids.discard(doc_id)
+            self.collection.delete(where={"doc_id": doc_id})
+        else:
+            with self._index_lock:
+                stale = [k for k, e in self.knowledge_base.items() if e["meta"].get("doc_id") == doc_id]
+                for chunk_id in stale:
+                    self.lexical_index.remove(chunk_id)
+                    del self.knowledge_base[chunk_id]
+                self.indexed_ids.discard(doc_id)
+
+    def _log_indexed(self, title: str, chunk_count: int):
+        if self.collection:
+            print(f"[RAG] Indexed document: {title} ({chunk_count} chunks)")
         else:
-            # Fallback to in-memory
-            self.knowledge_base.append({
-                "id": doc_id,
-                "content": content, 
-                "meta": metadata
-            })
-            print(f"[RAG] In-memory indexed: {metadata.get('title', doc_id)}")
-
-    async def query(self, query_text: str, top_k: int = 3) -> List[Dict]:
+            print(f"[RAG] In-memory indexed: {title} ({chunk_count} chunks)")
+
+    async def query(self, query_text: str, top_k: int = 3, mode: str = None) -> List[Dict]:
         """
         Query the knowledge base for relevant documents.
         """
-        if self.collection and self.collection.count() > 0:
-            embedding = self._get_embedding(query_text)
-            if embedding:
-                results = self.collection.query(
-                    query_embeddings=[embedding],
-                    n_results=min(top_k, self.collection.count())
-                )
-            else:
-                results = self.collection.query(
-                    query_texts=[query_text],
-                    n_results=min(top_k, self.collection.count())
-                )
-            
-            # Format results
+        result = await self.search(query_text, top_k, mode)
+        return result["results"]
+
+    async def search(self, query_text: str, top_k: int = 3, mode: str = None) -> Dict[str, Any]:
+        """
+        Retrieve top_k chunks with scores and per-leg latency.
+        mode is 'hybrid' (vector + BM25 with reciprocal rank fusion), 'vector' or 'lexical'.
+        """
+        mode = mode or self.retrieval_mode
+        if mode not in RETRIEVAL_MODES:
+            raise ValueError(f"Unknown retrieval mode '{mode}' (expected one of {', '.join(RETRIEVAL_MODES)})")
+        timings: Dict[str, float] = {}
+
+        if not self.collection:
+            # Fallback to in-memory BM25
+            print(f"[RAG] Searching in-memory ({len(self.knowledge_base)} chunks)")
+            hits, timings["lexical_ms"] = self._timed("lexical", self.lexical_index.search, query_text, top_k)
             docs = []
-            for i, doc in enumerate(results.get('documents', [[]])[0]):
-                docs.append({
-                    "content": doc,
-                    "metadata": results.get('metadatas', [[]])[0][i] if results.get('metadatas') else {}
-                })
-            print(f"[RAG] Found {len(docs)} relevant documents")
-            return docs
+            for chunk_id, score in hits:
+                entry = self.knowledge_base.get(chunk_id)
+                if entry is not None:  # removed after the lexical lookup
+                    docs.append({**entry, "score": score})
+            return {"results": docs, "mode": "lexical", "timings": timings}
+
+        if self.collection.count() == 0:
+            return {"results": [], "mode": mode, "timings": timings}
+
+        if mode == "vector":
+            # Embedding call and Chroma query both block; keep them off the event loop
+            docs, timings["vector_ms"] = await asyncio.to_thread(self._timed, "vector", self._vector_search, query_text, top_k)
+        elif mode == "lexical":
+            hits, timings["lexical_ms"] = self._timed("lexical", self.lexical_index.search, query_text, top_k)
+            docs = self._fetch_chunks([{"id": chunk_id, "score": score} for chunk_id, score in hits])
+        else:
+            # Each leg ranks a wider candidate pool than top_k before fusion
+            pool = max(top_k * 4, 20)
+            (vector_docs, timings["vector_ms"]), (lexical_hits, timings["lexical_ms"]) = await asyncio.gather(
+                asyncio.to_thread(self._timed, "vector", self._vector_search, query_text, pool),
+                asyncio.to_thread(self._timed, "lexical", self.lexical_index.search, query_text, pool)
+            )
+            docs = self._fetch_chunks(self._fuse(vector_docs, lexical_hits)[:top_k])
+
+        print(f"[RAG] Found {len(docs)} relevant documents ({mode})")
+        return {"results": docs, "mode": mode, "timings": timings}
+
+    def _timed(self, leg: str, fn, *args) -> Tuple[Any, float]:
+        started = time.perf_counter()
+        result = fn(*args)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self.retrieval_timings[leg][0] += 1
+        self.retrieval_timings[leg][1] += elapsed_ms
+        return result, round(elapsed_ms, 3)
+
+    def _vector_search(self, query_text: str, n_results: int) -> List[Dict]:
+        n_results = min(n_results, self.collection.count())
+        include = ["documents", "metadatas", "distances"]
+        embedding = self._get_embedding(query_text, task_type="retrieval_query")
+        if embedding:
+            results = self.collection.query(query_embeddings=[embedding], n_results=n_results, include=include)
         else:
-            # Fallback to in-memory
-            print(f"[RAG] Searching in-memory ({len(self.knowledge_base)} docs)")
-            return self.knowledge_base[:top_k]
+            results = self.collection.query(query_texts=[query_text], n_results=n_results, include=include)
+
+        # Format results; cosine distance -> similarity
+        return [
+            {
+                "id": chunk_id,
+                "content": document,
+                "metadata": metadata or {},
+                "score": 1 - distance
+            }
+            for chunk_id, document, metadata, distance in zip(
+                results["ids"][0], results["documents"][0], results["metadatas"][0], results["distances"][0]
+            )
+        ]
+
+    def _fuse(self, vector_docs: List[Dict], lexical_hits: List[Tuple[str, float]]) -> List[Dict]:
+        """Reciprocal rank fusion of the two rankings, keeping each leg's own score."""
+        fused: Dict[str, Dict] = {}
+        for rank, doc in enumerate(vector_docs, start=1):
+            entry = fused.setdefault(doc["id"], {**doc, "score": 0.0})
+            entry["vector_score"] = doc["score"]
+            entry["score"] += 1 / (self.rrf_k + rank)
+        for rank, (chunk_id, score) in enumerate(lexical_hits, start=1):
+            entry = fused.setdefault(chunk_id, {"id": chunk_id, "score": 0.0})
+            entry["lexical_score"] = score
+            entry["score"] += 1 / (self.rrf_k + rank)
+        return sorted(fused.values(), key=lambda d: d["score"], reverse=True)
+
+    def _fetch_chunks(self, docs: List[Dict]) -> List[Dict]:
+        """Fill in content and metadata for hits that only came from the lexical index."""
+        missing = [d["id"] for d in docs if "content" not in d]
+        if missing:
+            result = self.collection.get(ids=missing, include=["documents", "metadatas"])
+            found = {
+                chunk_id: (document, metadata or {})
+                for chunk_id, document, metadata in zip(result["ids"], result["documents"], result["metadatas"])
+            }
+            for doc in docs:
+                if doc["id"] in found:
+                    doc["content"], doc["metadata"] = found[doc["id"]]
+        return [d for d in docs if "content" in d]
+
+    def _load_existing(self) -> set:
+        """
+        Rebuild the lexical index from the collection and collect distinct doc_ids.
+        Entries indexed before chunking count as their own document. A document counts
+        as indexed only once its completion marker was written (older documents: their
+        summary chunk, or no staged 'kind' at all); chunks of documents whose ingest
+        failed part-way are deleted.
+        """
+        result = self.collection.get(include=["documents", "metadatas"])
+        documents: Dict[str, List[Tuple[str, str]]] = {}
+        complete, staged = set(), set()
+        for entry_id, document, meta in zip(result["ids"], result["documents"], result["metadatas"]):
+            meta = meta or {}
+            doc_id = meta.get("doc_id", entry_id)
+            documents.setdefault(doc_id, []).append((entry_id, document or ""))
+            if meta.get("complete") or meta.get("kind") == "summary":
+                complete.add(doc_id)
+            elif "kind" in meta:
+                staged.add(doc_id)
+        complete |= documents.keys() - staged
+
+        for doc_id, entries in documents.items():
+            if doc_id in complete:
+                for entry_id, document in entries:
+                    self.lexical_index.add(entry_id, document)
+            else:
+                self.collection.delete(ids=[entry_id for entry_id, _ in entries])
+                print(f"[RAG] Removed incomplete document {doc_id} ({len(entries)} chunks)")
+        return complete
+
+    def _retrieval_stats(self) -> Dict[str, Any]:
+        return {
+            f"{leg}_avg_ms": round(total / calls, 3) if calls else None
+            for leg, (calls, total) in self.retrieval_timings.items()
+        }
+
+    def _embedding_cache_stats(self) -> Dict[str, Any]:
+        if not self.embedding_cache:
+            return {"enabled": False}
+        return {"enabled": True, **self.embedding_cache.get_stats()}
+
+    def document_count(self) -> int:
+        return len(self.indexed_ids)
 
     def get_stats(self) -> Dict[str, Any]:
         """Get statistics about the knowledge base."""
         if self.collection:
             return {
                 "type": "ChromaDB",
-                "document_count": self.collection.count(),
-                "embedding_model": self.embedding_model or "default"
+                "document_count": len(self.indexed_ids),
+                "chunk_count": self.collection.count(),
+                "embedding_model": self.embedding_model or "default",
+                "embedding_cache": self._embedding_cache_stats(),
+                "retrieval_mode": self.retrieval_mode,
+                "retrieval_latency": self._retrieval_stats()
             }
         else:
             return {
                 "type": "In-Memory",
-                "document_count": len(self.knowledge_base),
-                "embedding_model": None
+                "document_count": len(self.indexed_ids),
+                "chunk_count": len(self.knowledge_base),
+                "embedding_model": None,
+                "embedding_cache": self._embedding_cache_stats(),
+                "retrieval_mode": "lexical",
+                "retrieval_latency": self._retrieval_stats()
             }
+
+
+class DocumentWriter:
+    """
+    Indexes one document incrementally, page by page.
+    Chunks are buffered and flushed in embedding-batch-sized groups, so memory
+    stays bounded regardless of document size. The last chunk is held back until
+    close() and carries the completion marker; abort() deletes whatever was flushed.
+    """
+    def __init__(self, rag: RAGService, doc_id: str, metadata: Dict[str, Any], separator: str = "\n\n"):
+        self.rag = rag
+        self.doc_id = doc_id
+        self.metadata = metadata
+        self.separator = separator
+        self.offset = 0  # character offset of the next page in the full document text
+        self.chunk_count = 0
+        self._buffer: List[Tuple[str, str, Dict[str, Any]]] = []
+        self._started = False
+
+    async def add_page(self, text: str, page: int = 1, **extra_metadata):
+        if not self._started:
+            # Replace any previous version of this document
+            await asyncio.to_thread(self.rag._remove_document, self.doc_id)
+            self._started = True
+        for c in self.rag.chunker.chunk(text):
+            self._buffer.append((
+                f"{self.doc_id}_chunk_{self.chunk_count}",
+                c["text"],
+                {
+                    **self.metadata,
+                    **extra_metadata,
+                    "doc_id": self.doc_id,
+                    "chunk_index": self.chunk_count,
+                    "page": page,
+                    "offset": self.offset + c["start"]
+                }
+            ))
+            self.chunk_count += 1
+        self.offset += len(text) + len(self.separator)
+        if len(self._buffer) >= self.rag.embed_batch_size:
+            await self.flush()
+
+    async def flush(self):
+        # Keep the newest chunk buffered so the marked final chunk is always written last
+        if len(self._buffer) > 1:
+            entries, self._buffer = self._buffer[:-1], self._buffer[-1:]
+            await asyncio.to_thread(self.rag._write_chunks, entries)
+
+    async def close(self):
+        if self._buffer:
+            self._buffer[-1][2]["complete"] = True
+            entries, self._buffer = self._buffer, []
+            await asyncio.to_thread(self.rag._write_chunks, entries)
+        if self.chunk_count:
+            self.rag.indexed_ids.add(self.doc_id)
+            self.rag._log_indexed(self.metadata.get("title", self.doc_id), self.chunk_count)
+
+    async def abort(self):
+        """Discard the document after a failed ingest, including chunks already flushed."""
+        self._buffer = []
+        if self._started:
+            await asyncio.to_thread(self.rag._remove_document, self.doc_id, False)
@@ -0,0 +1,119 @@
+import os
+import time
+import heapq
+import asyncio
+import itertools
+from typing import Dict, Any
+
+# Lower runs first: interactive requests overtake queued batch and background work
+PRIORITIES = {"interactive": 0, "batch": 1, "background": 2}
+
+
+class TokenBucket:
+    """Refills continuously at capacity per minute; the level may go negative after reconciliation."""
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.level = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def delay(self, amount: float) -> float:
+        """Seconds until amount is available (0 if it is now)."""
+        if self.capacity <= 0:
+            return 0.0  # unlimited
+        self._refill()
+        amount = min(amount, self.capacity)
+        return 0.0 if self.level >= amount else (amount - self.level) / self.rate
+
+    def take(self, amount: float):
+        if self.capacity > 0:
+            self._refill()
+            self.level -= min(amount, self.capacity)
+
+    def adjust(self, amount: float):
+        """Charge (or refund, if negative) the difference between estimated and actual use."""
+        if self.capacity > 0:
+            self._refill()
+            self.level = min(self.capacity, self.level - amount)
+
+
+class RateLimiter:
+    """
+    Shared requests/min and tokens/min limits for the LLM provider.
+    Callers queue by priority class, then arrival; only the head of the queue may take
+    capacity, so a large batch cannot starve interactive calls queued after it.
+    LLM_REQUESTS_PER_MINUTE / LLM_TOKENS_PER_MINUTE set the limits (0 disables one).
+    """
+    def __init__(self, requests_per_minute: float = None, tokens_per_minute: float = None):
+        rpm = requests_per_minute if requests_per_minute is not None else float(os.getenv("LLM_REQUESTS_PER_MINUTE", "60"))
+        tpm = tokens_per_minute if tokens_per_minute is not None else float(os.getenv("LLM_TOKENS_PER_MINUTE", "1000000"))
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self._queue = []  # heap of (priority, seq)
+        self._seq = itertools.count()
+        self._changed = None  # asyncio.Condition, created inside the running loop
+        self.granted = dict.fromkeys(PRIORITIES, 0)
+        self.waited = dict.fromkeys(PRIORITIES, 0)
+        self.wait_seconds = 0.0
+
+    async def acquire(self, tokens: int, priority: str = "interactive"):
+        """Wait for one request slot and tokens of budget."""
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown priority '{priority}' (expected one of {', '.join(PRIORITIES)})")
+        if self._changed is None:
+            self._changed = asyncio.Condition()
+        entry = (PRIORITIES[priority], next(self._seq))
+        started = time.monotonic()
+        async with self._changed:
+            heapq.heappush(self._queue, entry)
+            try:
+                while True:
+                    if self._queue[0] == entry:
+                        delay = max(self.requests.delay(1), self.tokens.delay(tokens))
+                        if delay == 0:
+                            break
+                        try:
+                            await asyncio.wait_for(self._changed.wait(), delay)
+                        except asyncio.TimeoutError:
+                            pass
+                    else:
+                        await self._changed.wait()
+            except BaseException:
+                self._queue.remove(entry)
+                heapq.heapify(self._queue)
+                self._changed.notify_all()
+                raise
+            heapq.heappop(self._queue)
+            self.requests.take(1)
+            self.tokens.take(tokens)
+            self._changed.notify_all()
+
+        waited = time.monotonic() - started
+        self.granted[priority] += 1
+        if waited > 0.001:
+            self.waited[priority] += 1
+            self.wait_seconds += waited
+        return waited
+
+    def reconcile(self, estimated: int, actual: int):
+        """Correct the token bucket once the real usage of a call is known."""
+        self.tokens.adjust(actual - estimated)
+
+    def get_stats(self) -> Dict[str, Any]:
+        self.requests._refill()
+        self.tokens._refill()
+        return {
+            "requests_per_minute": self.requests.capacity,
+            "tokens_per_minute": self.tokens.capacity,
+            "requests_available": round(self.requests.level, 2),
+            "tokens_available": round(self.tokens.level),
+            "queued": len(self._queue),
+            "granted": self.granted,
+            "waited": self.waited,
+            "wait_seconds": round(self.wait_seconds, 3)
+        }
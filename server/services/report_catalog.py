@@ -0,0 +1,132 @@
+import os
+import time
+import hashlib
+from datetime import datetime
+from typing import Dict, Any
+
+from sqlalchemy import select, delete, func
+
+from database import SessionLocal, ReportRecord
+
+MAX_PAGE_SIZE = 500
+
+
+class ReportCatalog:
+    """
+    Index of the PDFs in REPORTS_DIR, kept in the database so listing never scans the
+    directory. Rows are written when a report is rendered and removed when it is deleted
+    or evicted. The generation changes on every write and feeds the listing ETag.
+    Methods are blocking; call them through asyncio.to_thread from request handlers.
+    """
+    def __init__(self, directory: str, session_factory=SessionLocal):
+        self.directory = directory
+        self.session_factory = session_factory
+        self.generation = time.time_ns()
+
+    def _touch(self):
+        self.generation += 1
+
+    def add(self, filename: str, client: str = None, compliance_score: int = None):
+        """Record a rendered report (re-rendering the same filename updates its row)."""
+        path = os.path.join(self.directory, filename)
+        stat = os.stat(path)
+        values = {
+            "client": client,
+            "compliance_score": compliance_score,
+            "size_bytes": stat.st_size,
+            "created_at": datetime.fromtimestamp(stat.st_mtime)
+        }
+        with self.session_factory() as db:
+            record = db.execute(select(ReportRecord).where(ReportRecord.filename == filename)).scalar_one_or_none()
+            if record is None:
+                db.add(ReportRecord(filename=filename, **values))
+            else:
+                for key, value in values.items():
+                    setattr(record, key, value)
+            db.commit()
+        self._touch()
+
+    def remove(self, filename: str) -> bool:
+        with self.session_factory() as db:
+            removed = db.execute(delete(ReportRecord).where(ReportRecord.filename == filename)).rowcount
+            db.commit()
+        if removed:
+            self._touch()
+        return bool(removed)
+
+    def sync(self):
+        """
+        Reconcile with the directory once (e.g. at startup): index PDFs written before the
+        catalog existed and drop rows whose file is gone.
+        """
+        on_disk = {}
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if entry.is_file() and entry.name.endswith(".pdf"):
+                    on_disk[entry.name] = entry.stat()
+
+        with self.session_factory() as db:
+            indexed = set(db.execute(select(ReportRecord.filename)).scalars().all())
+            # Oldest first, so ids (the listing order) follow creation time
+            missing = sorted((name for name in on_disk if name not in indexed), key=lambda n: on_disk[n].st_mtime)
+            stale = [name for name in indexed if name not in on_disk]
+            if stale:
+                db.execute(delete(ReportRecord).where(ReportRecord.filename.in_(stale)))
+            db.add_all([
+                ReportRecord(
+                    filename=name,
+                    size_bytes=on_disk[name].st_size,
+                    created_at=datetime.fromtimestamp(on_disk[name].st_mtime)
+                )
+                for name in missing
+            ])
+            db.commit()
+        if missing or stale:
+            self._touch()
+            print(f"[ReportCatalog] Indexed {len(missing)} reports, dropped {len(stale)} missing")
+
+    def etag(self, *params) -> str:
+        """Weak validator for one listing: changes whenever the catalog does."""
+        digest = hashlib.sha1(repr((self.generation, params)).encode("utf-8")).hexdigest()
+        return f'W/"{digest[:20]}"'
+
+    def query(self, client: str = None, since: datetime = None, until: datetime = None,
+              cursor: int = None, limit: int = 50) -> Dict[str, Any]:
+        """
+        Newest first, keyset-paginated on id; pass next_cursor to get the next page.
+        count is the number of reports matching the filters across all pages.
+        """
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        filters = []
+        if client is not None:
+            filters.append(ReportRecord.client == client)
+        if since is not None:
+            filters.append(ReportRecord.created_at >= since)
+        if until is not None:
+            filters.append(ReportRecord.created_at < until)
+        query = select(ReportRecord).where(*filters)
+        if cursor is not None:
+            query = query.where(ReportRecord.id < cursor)
+        query = query.order_by(ReportRecord.id.desc()).limit(limit + 1)
+
+        with self.session_factory() as db:
+            records = db.execute(query).scalars().all()
+            total = db.execute(select(func.count(ReportRecord.id)).where(*filters)).scalar_one()
+        reports = [_to_dict(record) for record in records[:limit]]
+        return {
+            "reports": reports,
+            "count": total,
+            "next_cursor": records[limit - 1].id if len(records) > limit else None
+        }
+
+
+def _to_dict(record: ReportRecord) -> Dict[str, Any]:
+    return {
+        "id": record.id,
+        "filename": record.filename,
+        "client": record.client,
+        "compliance_score": record.compliance_score,
+        "size_bytes": record.size_bytes,
+        "created_at": record.created_at.timestamp(),
+        "download_url": f"/api/reports/download/{record.filename}"
+    }
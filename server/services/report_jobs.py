@@ -0,0 +1,163 @@
+import os
+import time
+import uuid
+import asyncio
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Optional, AsyncIterator
+
+from tools.pdf_gen import PDFGenerator, REPORTS_DIR
+from tools.report_cache import ReportCache
+
+TERMINAL = ("done", "error")
+
+
+def render_report(findings: list, client_name: str, compliance_score: int = None) -> str:
+    """Render one PDF report and return its filename. Runs in worker processes."""
+    return PDFGenerator().generate_report(findings, client_name, compliance_score=compliance_score)
+
+
+class ReportJob:
+    """State of one report request; every status change is appended to events."""
+    def __init__(self, client: str, findings: int):
+        self.id = uuid.uuid4().hex
+        self.client = client
+        self.findings = findings
+        self.status = "queued"
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.events: List[Dict[str, Any]] = []
+        self._changed = asyncio.Condition()
+
+    async def update(self, status: str, **extra):
+        self.status = status
+        self.events.append({"status": status, "at": time.time(), **extra})
+        async with self._changed:
+            self._changed.notify_all()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "client": self.client,
+            "findings": self.findings,
+            "status": self.status,
+            "created_at": self.created_at,
+            "result": self.result,
+            "error": self.error,
+            "events": list(self.events)
+        }
+
+    async def follow(self) -> AsyncIterator[Dict[str, Any]]:
+        """Yield every status event, waiting for new ones until the job finishes."""
+        sent = 0
+        while True:
+            async with self._changed:
+                await self._changed.wait_for(lambda: len(self.events) > sent)
+            while sent < len(self.events):
+                yield self.events[sent]
+                sent += 1
+            if self.status in TERMINAL:
+                return
+
+
+class ReportJobs:
+    """
+    Background report generation. Jobs run as asyncio tasks; the fpdf rendering, which
+    is CPU-bound, runs in a process pool so the API stays responsive while many
+    reports are produced. Rendered reports are recorded in the catalog, if given.
+    """
+    def __init__(self, officer, max_workers: int = None, retention: int = None, catalog=None):
+        self.officer = officer
+        self.catalog = catalog
+        # REPORT_WORKERS=0 renders on a thread in this process
+        self.max_workers = max_workers if max_workers is not None else int(os.getenv("REPORT_WORKERS", str(os.cpu_count() or 1)))
+        self.retention = retention or int(os.getenv("REPORT_JOB_RETENTION", "1000"))
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._jobs: "OrderedDict[str, ReportJob]" = OrderedDict()
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self.cache = ReportCache(REPORTS_DIR)
+        if catalog is not None:
+            self.cache.on_evict = catalog.remove
+
+    def _get_pool(self) -> Optional[ProcessPoolExecutor]:
+        if self.max_workers <= 0:
+            return None
+        if self._pool is None:
+            # spawn, not fork: the server is multi-threaded by the time the pool starts
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._pool
+
+    def close(self):
+        for task in self._tasks.values():
+            task.cancel()
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+    async def _render(self, findings: list, client_name: str, compliance_score: int = None) -> str:
+        # Identical reports are served from the cache without a trip to the pool
+        filename = self.cache.filename_for(findings, client_name, "Compliance Audit Report", compliance_score)
+        if self.cache.lookup(filename):
+            return filename
+        pool = self._get_pool()
+        if pool is None:
+            filename = await asyncio.to_thread(render_report, findings, client_name, compliance_score)
+        else:
+            loop = asyncio.get_running_loop()
+            filename = await loop.run_in_executor(pool, render_report, findings, client_name, compliance_score)
+        if self.catalog is not None:
+            await asyncio.to_thread(self.catalog.add, filename, client_name, compliance_score)
+        await asyncio.to_thread(self.cache.sweep)
+        return filename
+
+    def submit(self, findings: list, client_name: str, compliance_score: int = None) -> ReportJob:
+        job = ReportJob(client_name, len(findings))
+        job.events.append({"status": "queued", "at": job.created_at})
+        self._jobs[job.id] = job
+        self._tasks[job.id] = asyncio.create_task(self._run(job, findings, compliance_score))
+        self._prune()
+        return job
+
+    async def _run(self, job: ReportJob, findings: list, compliance_score: int = None):
+        async def render(*args):
+            await job.update("rendering")
+            return await self._render(*args)
+
+        try:
+            await job.update("compiling")
+            job.result = await self.officer.generate_package(findings, job.client, compliance_score, render)
+            await job.update("done", filename=job.result["filename"])
+        except Exception as e:
+            job.error = str(e)
+            await job.update("error", error=job.error)
+        finally:
+            self._tasks.pop(job.id, None)
+
+    def _prune(self):
+        """Forget the oldest finished jobs beyond the retention limit."""
+        excess = len(self._jobs) - self.retention
+        for job_id in list(self._jobs):
+            if excess <= 0:
+                break
+            if self._jobs[job_id].status in TERMINAL:
+                del self._jobs[job_id]
+                excess -= 1
+
+    def get(self, job_id: str) -> Optional[ReportJob]:
+        return self._jobs.get(job_id)
+
+    async def wait(self, job: ReportJob) -> ReportJob:
+        async for _ in job.follow():
+            pass
+        return job
+
+    def get_stats(self) -> Dict[str, Any]:
+        counts: Dict[str, int] = {}
+        for job in self._jobs.values():
+            counts[job.status] = counts.get(job.status, 0) + 1
+        return {"jobs": counts, "running": len(self._tasks), "workers": self.max_workers,
+                "cache": self.cache.get_stats()}
@@ -0,0 +1,198 @@
+import os
+import time
+import asyncio
+from collections import deque
+from typing import List, Dict, Any, Optional, Set
+
+
+class StreamSession:
+    """
+    One producer connection (NDJSON upload or WebSocket).
+    Alerts for its events are delivered to its outbox as each batch is scanned. The
+    outbox holds at most STREAM_OUTBOX_SIZE alerts; further alerts are dropped and
+    counted until the consumer catches up.
+    """
+    def __init__(self, monitor: "StreamMonitor"):
+        self.monitor = monitor
+        self.outbox: asyncio.Queue = asyncio.Queue(maxsize=monitor.outbox_size)
+        self.received = 0
+        self.alerts = 0
+        self.dropped = 0
+        self.pending = 0
+        self.closed = False
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    async def put(self, event: Dict[str, Any]):
+        """Queue one event, waiting while the scanner is behind."""
+        self.received += 1
+        self.pending += 1
+        self._idle.clear()
+        await self.monitor._enqueue(self, event)
+
+    def _done(self, count: int):
+        self.pending -= count
+        if self.pending <= 0:
+            self._idle.set()
+
+    async def drain(self):
+        """Wait until every event put so far has been scanned."""
+        await self._idle.wait()
+
+    def deliver(self, alert: Dict[str, Any]):
+        if self.closed:
+            return
+        try:
+            self.outbox.put_nowait(alert)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            self.monitor.alerts_dropped += 1
+
+    def close(self):
+        self.closed = True
+        self.monitor._sessions.discard(self)
+
+
+class StreamMonitor:
+    """
+    Continuous event ingestion for the Risk Sentinel.
+    Producers put events on a bounded asyncio queue and wait when it is full, which
+    pushes back on the upload. A worker drains the queue in micro-batches (up to
+    batch_size events or batch_wait_ms, whichever comes first), scans each batch
+    with the sentinel and routes alerts back to the producing session.
+    """
+    def __init__(self, sentinel):
+        self.sentinel = sentinel
+        self.queue_size = int(os.getenv("STREAM_QUEUE_SIZE", "10000"))
+        self.batch_size = int(os.getenv("STREAM_BATCH_SIZE", "500"))
+        self.batch_wait = float(os.getenv("STREAM_BATCH_WAIT_MS", "50")) / 1000
+        self.outbox_size = int(os.getenv("STREAM_OUTBOX_SIZE", "10000"))
+        self.rate_window = float(os.getenv("STREAM_RATE_WINDOW_SECONDS", "60"))
+        self._queue: Optional[asyncio.Queue] = None  # created on first use, inside the running loop
+        self._worker: Optional[asyncio.Task] = None
+        self._sessions: Set[StreamSession] = set()
+        self._recent = deque()  # (finished_at, events) per batch, for sustained throughput
+        self._started_at: Optional[float] = None
+
+        self.events_received = 0
+        self.events_scanned = 0
+        self.alerts_raised = 0
+        self.alerts_dropped = 0
+        self.batches = 0
+        self.errors = 0
+        self.backpressure_waits = 0
+        self.max_queue_depth = 0
+        self.scan_ms = 0.0
+
+    def open_session(self) -> StreamSession:
+        self._start()
+        session = StreamSession(self)
+        self._sessions.add(session)
+        return session
+
+    def _start(self):
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.queue_size)
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+            self._started_at = self._started_at or time.monotonic()
+
+    async def stop(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+    async def _enqueue(self, session: StreamSession, event: Dict[str, Any]):
+        if self._queue.full():
+            self.backpressure_waits += 1
+        await self._queue.put((session, event))
+        self.events_received += 1
+        self.max_queue_depth = max(self.max_queue_depth, self._queue.qsize())
+
+    async def _next_batch(self) -> List[tuple]:
+        """Block for one event, then collect more until the batch is full or the wait runs out."""
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.batch_wait
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        while True:
+            batch = await self._next_batch()
+            started = time.perf_counter()
+            try:
+                await self._scan(batch)
+            except Exception as e:
+                self.errors += 1
+                print(f"[StreamMonitor] Batch of {len(batch)} events failed: {e}")
+            finally:
+                self.scan_ms += (time.perf_counter() - started) * 1000
+                self._finish(batch)
+
+    async def _scan(self, batch: List[tuple]):
+        owners = {id(event): session for session, event in batch}
+        risks = await self.sentinel.scan_batch([event for _, event in batch])
+        for event, risk in risks:
+            session = owners.get(id(event))
+            if session is None:
+                continue
+            session.alerts += 1
+            self.alerts_raised += 1
+            session.deliver({
+                **risk,
+                "event_id": event.get("id"),
+                "detector": event.get("detector"),
+                "detected_pattern": event.get("detected_pattern")
+            })
+
+    def _finish(self, batch: List[tuple]):
+        counts: Dict[StreamSession, int] = {}
+        for session, _ in batch:
+            counts[session] = counts.get(session, 0) + 1
+        for session, count in counts.items():
+            session._done(count)
+
+        now = time.monotonic()
+        self.batches += 1
+        self.events_scanned += len(batch)
+        self._recent.append((now, len(batch)))
+        while self._recent and now - self._recent[0][0] > self.rate_window:
+            self._recent.popleft()
+
+    def get_stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        recent = [count for finished, count in self._recent if now - finished <= self.rate_window]
+        span = min(self.rate_window, now - self._started_at) if self._started_at else 0.0
+        return {
+            "events_received": self.events_received,
+            "events_scanned": self.events_scanned,
+            "alerts": self.alerts_raised,
+            "alerts_dropped": self.alerts_dropped,
+            "batches": self.batches,
+            "errors": self.errors,
+            "avg_batch_size": round(self.events_scanned / self.batches, 1) if self.batches else 0.0,
+            "throughput_eps": round(sum(recent) / span, 1) if span > 0 else 0.0,
+            "avg_scan_ms_per_batch": round(self.scan_ms / self.batches, 3) if self.batches else 0.0,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "max_queue_depth": self.max_queue_depth,
+            "queue_capacity": self.queue_size,
+            "backpressure_waits": self.backpressure_waits,
+            "active_sessions": len(self._sessions)
+        }
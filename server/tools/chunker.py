@@ -0,0 +1,104 @@
+import re
+from bisect import bisect_right
+from typing import List, Dict, Any, Optional
+
+# Section boundaries: blank lines, or a line opening with a legal heading
+SECTION_PATTERN = re.compile(
+    r"\n[ \t]*\n|\n(?=[ \t]*(?:Article|Art\.|Section|Chapter|Part|Annex|Schedule|§)\s*[\dIVXLC])",
+    re.IGNORECASE
+)
+# Sentence boundaries: terminal punctuation followed by whitespace
+SENTENCE_PATTERN = re.compile(r"(?<=[.!?;:])\s+")
+
+
+class DocumentChunker:
+    """
+    Splits long documents into overlapping, section-aware chunks for embedding.
+    Chunks keep their character offsets into the source text.
+    """
+    def __init__(self, chunk_size: int = 1200, chunk_overlap: int = 200):
+        self.chunk_size = chunk_size
+        self.chunk_overlap = min(chunk_overlap, chunk_size // 2)
+
+    def chunk(self, text: str, page_breaks: Optional[List[int]] = None) -> List[Dict[str, Any]]:
+        """
+        Chunk text into dicts with 'text', 'index', 'start', 'end' and 'page'.
+        page_breaks holds the character offset at which each page starts.
+        """
+        units = self._sentence_spans(text)
+        chunks = []
+        current: List[tuple] = []
+        current_len = 0
+
+        for start, end, new_section in units:
+            length = end - start
+            # Flush on overflow, or at a section boundary once the chunk is reasonably full
+            if current and (current_len + length > self.chunk_size or
+                            (new_section and current_len >= self.chunk_size // 2)):
+                chunks.append((current[0][0], current[-1][1]))
+                current = self._overlap_tail(current) if not new_section else []
+                current_len = sum(e - s for s, e in current)
+                if current_len + length > self.chunk_size:
+                    current, current_len = [], 0
+            current.append((start, end))
+            current_len += length
+
+        if current:
+            chunks.append((current[0][0], current[-1][1]))
+
+        return [
+            {
+                "index": i,
+                "text": text[start:end],
+                "start": start,
+                "end": end,
+                "page": self._page_for(start, page_breaks)
+            }
+            for i, (start, end) in enumerate(chunks)
+        ]
+
+    def _sentence_spans(self, text: str) -> List[tuple]:
+        """Yield (start, end, starts_new_section) spans, hard-splitting oversized sentences."""
+        spans = []
+        section_start = 0
+        boundaries = [m.start() for m in SECTION_PATTERN.finditer(text)] + [len(text)]
+
+        for section_end in boundaries:
+            new_section = True
+            sentence_start = section_start
+            for m in list(SENTENCE_PATTERN.finditer(text, section_start, section_end)) + [None]:
+                sentence_end = m.start() if m else section_end
+                for start, end in self._trim_and_split(text, sentence_start, sentence_end):
+                    spans.append((start, end, new_section))
+                    new_section = False
+                if m:
+                    sentence_start = m.end()
+            section_start = section_end
+
+        return spans
+
+    def _trim_and_split(self, text: str, start: int, end: int) -> List[tuple]:
+        while start < end and text[start].isspace():
+            start += 1
+        while end > start and text[end - 1].isspace():
+            end -= 1
+        if start >= end:
+            return []
+        return [(s, min(s + self.chunk_size, end)) for s in range(start, end, self.chunk_size)]
+
+    def _overlap_tail(self, spans: List[tuple]) -> List[tuple]:
+        """Trailing sentences of the previous chunk to carry into the next one."""
+        tail = []
+        size = 0
+        for start, end in reversed(spans[1:]):
+            if size + (end - start) > self.chunk_overlap:
+                break
+            tail.insert(0, (start, end))
+            size += end - start
+        return tail
+
+    @staticmethod
+    def _page_for(offset: int, page_breaks: Optional[List[int]]) -> int:
+        if not page_breaks:
+            return 1
+        return max(1, bisect_right(page_breaks, offset))
@@ -0,0 +1,147 @@
+import os
+import re
+import threading
+from typing import List, Dict, Any, Optional
+
+# Local approximation of a subword tokenizer: words are split into pieces of up to
+# four characters and every punctuation mark is a token. Close to Gemini's counts on
+# English and legal text, and deterministic without a network call.
+TOKEN_PATTERN = re.compile(r"\w{1,4}|[^\w\s]")
+
+
+def count_tokens(text: str) -> int:
+    return sum(1 for _ in TOKEN_PATTERN.finditer(text))
+
+
+def truncate_tokens(text: str, max_tokens: int) -> str:
+    """The longest prefix of text with at most max_tokens tokens."""
+    if max_tokens <= 0:
+        return ""
+    end = 0
+    for count, match in enumerate(TOKEN_PATTERN.finditer(text), start=1):
+        end = match.end()
+        if count == max_tokens:
+            break
+    return text[:end]
+
+
+def _span(chunk: Dict[str, Any]):
+    """(doc_id, start, end) of a retrieved chunk in its source document, if known."""
+    meta = chunk.get("metadata") or chunk.get("meta") or {}
+    if "doc_id" not in meta or "offset" not in meta:
+        return None
+    start = meta["offset"]
+    return meta["doc_id"], start, start + len(chunk["content"])
+
+
+class ContextPacker:
+    """
+    Assembles prompt context from ranked chunks under a token budget.
+    Chunks are taken in rank order; repeats and text already covered by a higher-ranked
+    overlapping chunk of the same document are skipped, and the last chunk that does
+    not fit is cut to the remaining budget.
+    """
+    def __init__(self, budget_tokens: int = None, min_chunk_tokens: int = 32):
+        self.budget_tokens = budget_tokens or int(os.getenv("PROMPT_CONTEXT_TOKENS", "1500"))
+        self.min_chunk_tokens = min_chunk_tokens
+        self._lock = threading.Lock()
+        self.prompts = 0
+        self.prompt_tokens = 0
+        self.context_tokens = 0
+        self.duplicates = 0
+        self.dropped = 0
+
+    def pack(self, chunks: List[Dict[str, Any]], budget_tokens: Optional[int] = None,
+             separator: str = "\n\n") -> Dict[str, Any]:
+        """
+        chunks are dicts with 'content' (RAG results) in rank order, or plain strings.
+        Returns the packed text with its token count and what was kept, skipped and cut.
+        """
+        budget = budget_tokens or self.budget_tokens
+        separator_tokens = count_tokens(separator)
+        parts: List[str] = []
+        seen = set()
+        covered: Dict[str, List[tuple]] = {}  # doc_id -> spans already included
+        used = included = duplicates = dropped = truncated = 0
+
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = {"content": chunk}
+            text = chunk["content"].strip()
+            key = " ".join(text.lower().split())
+            if not key or key in seen:
+                duplicates += 1
+                continue
+
+            span = _span(chunk)
+            if span is not None:
+                doc_id, start, end = span
+                text = _uncovered(chunk["content"], start, end, covered.get(doc_id, [])).strip()
+                if not text:
+                    duplicates += 1
+                    continue
+
+            remaining = budget - used - (separator_tokens if parts else 0)
+            tokens = count_tokens(text)
+            if tokens > remaining:
+                if remaining < self.min_chunk_tokens:
+                    dropped += 1
+                    continue
+                text = truncate_tokens(text, remaining)
+                tokens = count_tokens(text)
+                truncated += 1
+
+            seen.add(key)
+            if span is not None:
+                covered.setdefault(span[0], []).append(span[1:])
+            used += tokens + (separator_tokens if parts else 0)
+            parts.append(text)
+            included += 1
+
+        with self._lock:
+            self.context_tokens += used
+            self.duplicates += duplicates
+            self.dropped += dropped
+        return {
+            "text": separator.join(parts),
+            "tokens": used,
+            "budget": budget,
+            "chunks": included,
+            "duplicates": duplicates,
+            "dropped": dropped,
+            "truncated": truncated
+        }
+
+    def record_prompt(self, prompt: str) -> int:
+        """Count a prompt that is about to be sent; returns its size in tokens."""
+        tokens = count_tokens(prompt)
+        with self._lock:
+            self.prompts += 1
+            self.prompt_tokens += tokens
+        return tokens
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "prompts": self.prompts,
+            "prompt_tokens": self.prompt_tokens,
+            "avg_prompt_tokens": round(self.prompt_tokens / self.prompts, 1) if self.prompts else 0.0,
+            "context_tokens": self.context_tokens,
+            "context_budget": self.budget_tokens,
+            "duplicates_skipped": self.duplicates,
+            "chunks_dropped": self.dropped
+        }
+
+
+def _uncovered(content: str, start: int, end: int, spans: List[tuple]) -> str:
+    """The part of content (at [start, end) in its document) not inside any included span."""
+    lo, hi = start, end
+    for s, e in spans:
+        if s <= lo and e >= hi:
+            return ""
+        if s <= lo < e:
+            lo = e  # overlap at the head (chunk overlap with its predecessor)
+        elif s < hi <= e:
+            hi = s  # overlap at the tail
+    if lo >= hi:
+        return ""
+    return content[lo - start:hi - start]
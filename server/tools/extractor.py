@@ -1,5 +1,87 @@
 import re
-from typing import List
+from typing import List, Tuple, Optional
+
+NO_OBLIGATIONS = "No explicit obligations found, but manual review recommended."
+
+# Searched with str.find in lowercased text, which is several times faster than a regex
+KEYWORDS = ("must", "shall", "required", "mandatory")
+# Longest run of text ObligationStream carries between chunks waiting for a sentence end
+MAX_SENTENCE_CHARS = 5000
+
+# Tokens that end in "." without ending the sentence, e.g. "Art. 5.1" or "Sec. 3(b)"
+ABBREVIATIONS = frozenset({
+    "art", "arts", "sec", "secs", "para", "paras", "no", "nos", "ch", "chap", "cl", "subs",
+    "reg", "regs", "dir", "ann", "app", "fig", "p", "pp", "vol", "cf", "viz", "etc", "approx",
+    "e.g", "i.e", "incl", "excl", "resp", "vs", "v", "mr", "mrs", "ms", "dr", "prof", "inc",
+    "ltd", "co", "corp", "dept", "u.s", "u.k", "e.u", "jan", "feb", "mar", "apr", "jun", "jul",
+    "aug", "sep", "sept", "oct", "nov", "dec",
+})
+
+
+def _terminator() -> str:
+    """
+    A run of terminal punctuation, plus closing quotes/brackets, that ends a sentence.
+    A lone "." after an abbreviation or a single-letter initial ("J. Smith", "Annex A.")
+    does not. Lookbehinds must be fixed-width, so abbreviations are grouped by length.
+    """
+    by_length = {}
+    for word in sorted(ABBREVIATIONS):
+        by_length.setdefault(len(word), []).append(re.escape(word))
+    not_abbreviation = "".join(
+        rf"(?<!\b(?i:{'|'.join(words)})\.)" for _, words in sorted(by_length.items())
+    ) + r"(?<!\b[^\W\d_]\.)"
+    return rf"[.!?](?<![.!?][.!?])(?:(?<=[!?])[.!?]*|(?<=\.)[.!?]+|{not_abbreviation})[\"')\]]*"
+
+
+# Sentence end: a terminator followed by whitespace or the end of the text.
+# "Art. 5.1" never splits: "Art" is an abbreviation and no whitespace follows the dot in "5.1".
+NEXT_BOUNDARY = re.compile(_terminator() + r"(?=\s|\Z)")
+# The last sentence end before endpos (greedy, so the regex engine backtracks from endpos)
+LAST_BOUNDARY = re.compile(r"(?s).*" + _terminator() + r"(?=\s)")
+
+
+class Obligation(str):
+    """An obligation sentence; start/end are its character offsets in the source text."""
+    __slots__ = ("start", "end")
+
+    def __new__(cls, text: str, start: int, end: int):
+        obligation = super().__new__(cls, text)
+        obligation.start = start
+        obligation.end = end
+        return obligation
+
+
+def _next_keyword(lowered: str, start: int, positions: List[int]) -> int:
+    """
+    Position of the first keyword at or after start, or -1. positions holds each
+    keyword's next occurrence and is only refreshed once start has passed it.
+    """
+    first = -1
+    for i, position in enumerate(positions):
+        if position != -1 and position < start:
+            position = positions[i] = lowered.find(KEYWORDS[i], start)
+        if position != -1 and (first == -1 or position < first):
+            first = position
+    return first
+
+
+def _sentence_start(text: str, lo: int, hi: int) -> int:
+    """Start of the sentence containing position hi, searching no further back than lo."""
+    match = LAST_BOUNDARY.match(text, lo, hi)
+    return match.end() if match else lo
+
+
+def _sentence_end(text: str, pos: int, final: bool) -> Optional[Tuple[int, int]]:
+    """(sentence end, next sentence start) for the sentence containing pos."""
+    length = len(text)
+    match = NEXT_BOUNDARY.search(text, pos)
+    if match is None:
+        return (length, length) if final else None
+    # At the end of a chunk the next character is not known yet
+    if not final and match.end() == length:
+        return None
+    return match.start(), match.end()
+
 
 class ObligationExtractor:
     """
@@ -8,17 +90,91 @@ class ObligationExtractor:
     """
     def extract(self, text: str) -> List[str]:
         print(f"[Tool:ObligationExtractor] Analyzing text for obligations...")
-        obligations = []
-        
-        # Simple heuristic: find sentences with "must", "shall", "require"
-        sentences = text.replace('!', '.').replace('?', '.').split('.')
-        for s in sentences:
-            s_lower = s.strip().lower()
-            if any(keyword in s_lower for keyword in ["must", "shall", "required", "mandatory"]):
-                print(f"   -> Found obligation: {s.strip()[:50]}...")
-                obligations.append(s.strip())
-                
+        obligations = self.match(text)
+
         if not obligations:
-            obligations.append("No explicit obligations found, but manual review recommended.")
-            
+            obligations.append(NO_OBLIGATIONS)
+
         return obligations
+
+    def match(self, text: str) -> List[Obligation]:
+        """Return obligation sentences in text, without the empty-result placeholder."""
+        return self.scan(text)[0]
+
+    def scan(self, text: str, offset: int = 0, final: bool = True) -> Tuple[List[Obligation], int]:
+        """
+        Sentences containing "must", "shall", "required" or "mandatory", with offsets shifted
+        by offset. Linear in len(text): one lowercase copy is scanned forward for keywords
+        and sentence boundaries are located just around each hit, never in between.
+        With final=False the trailing unterminated sentence is left unread; the second
+        value is the position where reading stopped.
+        """
+        obligations: List[Obligation] = []
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            # A few non-ASCII letters change length when lowercased; keep offsets exact
+            lowered = "".join(c if len(c.lower()) != 1 else c.lower() for c in text)
+        positions = [lowered.find(keyword) for keyword in KEYWORDS]
+        start = 0
+        while True:
+            hit = _next_keyword(lowered, start, positions)
+            if hit == -1:
+                break
+            first = _sentence_start(text, start, hit)
+            bounds = _sentence_end(text, hit, final)
+            if bounds is None:
+                return obligations, first
+            end, start = bounds
+
+            sentence = text[first:end]
+            stripped = sentence.strip()
+            first += len(sentence) - len(sentence.lstrip())
+            obligations.append(Obligation(stripped, offset + first, offset + first + len(stripped)))
+
+        if final:
+            return obligations, len(text)
+        # Nothing pending: everything up to the last complete sentence is consumed
+        return obligations, _sentence_start(text, start, len(text))
+
+    def stream(self) -> "ObligationStream":
+        """Start incremental extraction over a sequence of text chunks."""
+        return ObligationStream(self)
+
+
+class ObligationStream:
+    """
+    Incremental obligation extraction over text chunks (e.g. PDF pages).
+    The trailing partial sentence of each chunk is carried into the next one;
+    offsets are relative to the start of the whole stream. A carry longer than
+    MAX_SENTENCE_CHARS (e.g. a table with no punctuation) is ended as a sentence,
+    so each character is rescanned a bounded number of times and memory stays bounded.
+    """
+    def __init__(self, extractor: ObligationExtractor):
+        self.extractor = extractor
+        self.obligations: List[str] = []
+        self._carry = ""
+        self._offset = 0
+
+    def feed(self, text: str) -> List[str]:
+        text = self._carry + text
+        found, consumed = self.extractor.scan(text, self._offset, final=False)
+        self._carry = text[consumed:]
+        self._offset += consumed
+        if len(self._carry) > MAX_SENTENCE_CHARS:
+            found += self._flush()
+        self.obligations.extend(found)
+        return found
+
+    def _flush(self) -> List[Obligation]:
+        """Scan the carry as if the text ended there."""
+        found, consumed = self.extractor.scan(self._carry, self._offset)
+        self._offset += consumed
+        self._carry = ""
+        return found
+
+    def close(self) -> List[str]:
+        """Flush the final partial sentence and return all obligations found."""
+        self.obligations.extend(self._flush())
+        if not self.obligations:
+            self.obligations.append(NO_OBLIGATIONS)
+        return self.obligations
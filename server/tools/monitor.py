@@ -1,27 +1,200 @@
 import re
-from typing import List, Dict
+import string
+from typing import List, Dict, Optional, Callable
+
+import numpy as np
+
+# Luhn lookup: value of a digit after doubling
+_LUHN_DOUBLED = [0, 2, 4, 6, 8, 1, 3, 5, 7, 9]
+
+
+def luhn_valid(number: str) -> bool:
+    """Luhn checksum over the digits in number (separators ignored)."""
+    digits = [ord(c) - 48 for c in number if c.isdigit()]
+    total = sum(digits[-1::-2]) + sum(_LUHN_DOUBLED[d] for d in digits[-2::-2])
+    return total % 10 == 0
+
+
+def card_valid(number: str) -> bool:
+    """Luhn over the match; a separated 17-19 digit match may be a 16-digit card followed by another number."""
+    digits = "".join(c for c in number if c.isdigit())
+    return luhn_valid(digits) or (len(digits) > 16 and luhn_valid(digits[:16]))
+
+
+def iban_valid(value: str) -> bool:
+    """ISO 13616 mod-97 check."""
+    iban = value.replace(" ", "").upper()
+    rearranged = iban[4:] + iban[:4]
+    return int("".join(str(int(c, 36)) for c in rearranged)) % 97 == 1
+
+
+# Character-class view of a batch, built with one bytes.translate so detector triggers can
+# be found with plain substring search instead of a regex pass over every payload: digits
+# become '0', uppercase letters 'A', spaces and dots become '-', and '(' and '+' are dropped,
+# so "4111 1111 1111 1111" -> "0000-0000-0000-0000", "(415) 555.2671" -> "000)-000-0000"
+# and "DE89 3704" -> "AA00-0000".
+_DROPPED = b"(+"
+_SHAPE = bytearray(range(256))
+_SHAPE[ord(" ")] = ord("-")
+_SHAPE[ord(".")] = ord("-")
+for _c in b"0123456789":
+    _SHAPE[_c] = ord("0")
+for _c in string.ascii_uppercase.encode():
+    _SHAPE[_c] = ord("A")
+SHAPE_TABLE = bytes(_SHAPE)
+
+
+def shape(text: str) -> bytes:
+    """The character-class view of text that detector triggers are matched against."""
+    return text.encode("utf-8", "surrogatepass").translate(SHAPE_TABLE, _DROPPED)
+
+
+class Detector:
+    """
+    A PII/PCI pattern registered with LogMonitor.
+    Lower priority values win when several detectors match one payload.
+    sensitive_only detectors fire only on events flagged 'sensitive'.
+    triggers are substrings of the shape() view: a payload is only matched
+    against pattern if one of them occurs in its view. Without triggers the
+    pattern runs on every payload.
+    """
+    def __init__(self, name: str, pattern: str, label: str, priority: int = 100,
+                 validator: Callable[[str], bool] = None, sensitive_only: bool = False,
+                 triggers: List[str] = None):
+        self.name = name
+        self.pattern = pattern
+        self.label = label
+        self.priority = priority
+        self.validator = validator
+        self.sensitive_only = sensitive_only
+        self.triggers = [t.encode() for t in triggers or []]
+        self.regex = re.compile(pattern)
+
+    def find(self, payload: str) -> bool:
+        for match in self.regex.finditer(payload):
+            if self.validator is None or self.validator(match.group()):
+                return True
+        return False
+
+
+DETECTORS: Dict[str, Detector] = {}
+
+
+def register_detector(detector: Detector):
+    """Add or replace a detector; monitors pick it up on their next scan."""
+    DETECTORS[detector.name] = detector
+
+
+register_detector(Detector(
+    "credit_card", r"\b(?:\d{13,19}|\d{4}(?:([ -])\d{4}(?:\1\d{4}){2}(?:\1?\d{1,3})?|[ -]\d{6}[ -]\d{5}))\b",
+    "Potential Credit Card Number (PCI Violation)", priority=10, validator=card_valid,
+    triggers=["0" * 13, "0000-0000-0000", "0000-000000-0"]
+))
+register_detector(Detector(
+    "iban", r"\b[A-Z]{2}\d{2}(?: ?[A-Z0-9]{4}){2,7}(?: ?[A-Z0-9]{1,3})?\b",
+    "Potential IBAN (PII Violation)", priority=20, validator=iban_valid,
+    triggers=["AA00"]
+))
+register_detector(Detector(
+    "ssn", r"\b(?!000|666|9\d\d)\d{3}-(?!00)\d{2}-(?!0000)\d{4}\b",
+    "Potential US Social Security Number (PII Violation)", priority=30,
+    triggers=["000-00-0000"]
+))
+register_detector(Detector(
+    "email", r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b",
+    "Email leak in restricted stream (PII Violation)", priority=40, sensitive_only=True,
+    triggers=["@"]
+))
+register_detector(Detector(
+    "phone", r"(?<![\w+])(?:\+\d{1,3}[ .-]?)?(?:\(\d{3}\) ?|\d{3}[ .-])\d{3}[ .-]\d{4}\b",
+    "Phone number in restricted stream (PII Violation)", priority=50, sensitive_only=True,
+    triggers=["000-000-0000", "0)000-0000", "0)-000-0000"]
+))
+
+
+def _line_starts(view: bytes) -> np.ndarray:
+    """Offset at which each newline-separated line of view starts."""
+    newlines = np.flatnonzero(np.frombuffer(view, dtype=np.uint8) == 10)
+    return np.concatenate(([0], newlines + 1))
+
+
+def _lines_containing(view: bytes, starts: np.ndarray, needle: bytes) -> Dict[int, tuple]:
+    """Map line number -> (start, end) for each line of view containing needle."""
+    lines = {}
+    last = len(starts) - 1
+    pos = view.find(needle)
+    while pos != -1:
+        line = int(starts.searchsorted(pos, side="right")) - 1
+        end = int(starts[line + 1]) - 1 if line < last else len(view)
+        lines[line] = (int(starts[line]), end)
+        pos = view.find(needle, end)
+    return lines
+
+
+def _find_triggers(view: bytes, needles) -> Dict[bytes, Dict[int, tuple]]:
+    """
+    Locate the lines containing each needle. Shorter needles are searched first;
+    a needle that contains an already-searched one is only checked on its lines.
+    """
+    starts = _line_starts(view)
+    found: Dict[bytes, Dict[int, tuple]] = {}
+    for needle in sorted(set(needles), key=len):
+        base = next((lines for known, lines in found.items() if known in needle), None)
+        if base is None:
+            found[needle] = _lines_containing(view, starts, needle)
+        else:
+            found[needle] = {i: span for i, span in base.items() if needle in view[span[0]:span[1]]}
+    return found
+
 
 class LogMonitor:
     """
     Tier 1 Tool: Log / Data Monitoring Tool
     Streams real-time data for PII/PCI violations (Regex based).
+    Payloads are scanned in batches: each batch is translated once into a
+    character-class view (see shape()) and searched for detector triggers, and
+    only the few candidate payloads run the precompiled patterns and validators.
     """
+    def scan_payloads(self, payloads: List[str], sensitive: List[bool] = None) -> List[Optional[Detector]]:
+        """
+        Scan many payloads at once.
+        Returns, per payload, the highest-priority matching detector or None.
+        """
+        results: List[Optional[Detector]] = [None] * len(payloads)
+        if not payloads:
+            return results
+        any_sensitive = bool(sensitive) and any(sensitive)
+        detectors = sorted(
+            (d for d in DETECTORS.values() if any_sensitive or not d.sensitive_only),
+            key=lambda d: d.priority
+        )
+        # Patterns never span a newline, so the batch can be searched joined by '\n'
+        view = shape("\n".join(p.replace("\n", " ") if "\n" in p else p for p in payloads))
+        hits = _find_triggers(view, [t for d in detectors for t in d.triggers])
+
+        for detector in detectors:
+            if detector.triggers:
+                candidates = sorted({i for t in detector.triggers for i in hits[t]})
+            else:
+                candidates = range(len(payloads))
+            for i in candidates:
+                if results[i] is not None:
+                    continue
+                if detector.sensitive_only and not sensitive[i]:
+                    continue
+                if detector.find(payloads[i]):
+                    results[i] = detector
+        return results
+
     def scan_for_anomalies(self, logs: List[Dict]) -> List[Dict]:
         print(f"[Tool:LogMonitor] Scanning {len(logs)} events for PII/PCI patterns...")
+        payloads = [str(log.get("payload", "")) or str(log) for log in logs]
+        detections = self.scan_payloads(payloads, [log.get("sensitive", False) is True for log in logs])
+
         anomalies = []
-        
-        # Regex for generic Credit Card (approximate 13-19 digits)
-        cc_pattern = re.compile(r'\b(?:\d[ -]*?){13,16}\b')
-        # Regex for Email
-        email_pattern = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
-        
-        for log in logs:
-            payload = str(log.get("payload", "")) or str(log)
-            if cc_pattern.search(payload):
-                log['detected_pattern'] = "Potential Credit Card Number (PCI Violation)"
-                anomalies.append(log)
-            elif email_pattern.search(payload) and log.get("sensitive", False) is True:
-                 log['detected_pattern'] = "Email leak in restricted stream (PII Violation)"
-                 anomalies.append(log)
-                 
+        for i in [i for i, detector in enumerate(detections) if detector is not None]:
+            log = logs[i]
+            log['detected_pattern'] = detections[i].label
+            log['detector'] = detections[i].name
+            anomalies.append(log)
         return anomalies
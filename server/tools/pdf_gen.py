@@ -2,6 +2,8 @@ from fpdf import FPDF
 from datetime import datetime
 import os
 
+from tools.report_cache import ReportCache
+
 # Ensure reports directory exists
 REPORTS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "reports")
 os.makedirs(REPORTS_DIR, exist_ok=True)
@@ -29,9 +31,17 @@ class PDFGenerator:
     """
     Industry-Grade Compliance Report Generator.
     Generates audit-ready PDF evidence packages with PCI-DSS checklist.
+    Identical requests reuse the previously rendered file (see ReportCache).
     """
+    def __init__(self, cache: ReportCache = None):
+        self.cache = cache or ReportCache(REPORTS_DIR)
     
     def generate_report(self, findings: list, company_name: str = "Your Organization", title: str = "Compliance Audit Report", compliance_score: int = None) -> str:
+        filename = self.cache.filename_for(findings, company_name, title, compliance_score)
+        if self.cache.lookup(filename):
+            print(f"[PDFGenerator] Reusing identical report {filename}")
+            return filename
+
         pdf = FPDF()
         pdf.set_auto_page_break(auto=True, margin=15)
         
@@ -94,10 +104,8 @@ class PDFGenerator:
         self._add_recommendations(pdf, findings, posture)
         
         # Save PDF
-        filename = f"compliance_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-        filepath = os.path.join(REPORTS_DIR, filename)
-        pdf.output(filepath)
-        print(f"[PDFGenerator] Saved report to {filepath}")
+        self.cache.write(filename, pdf.output)
+        print(f"[PDFGenerator] Saved report to {os.path.join(REPORTS_DIR, filename)}")
         
         return filename
     
@@ -124,7 +132,7 @@ class PDFGenerator:
         
         pdf.set_font("Arial", size=12)
         pdf.set_text_color(100, 100, 100)
-        pdf.cell(0, 10, txt=f"Report Generated: {datetime.now().strftime('%B %d, %Y at %H:%M')}", ln=1, align='C')
+        pdf.cell(0, 10, txt=f"Report Generated: {datetime.now().strftime('%B %d, %Y')}", ln=1, align='C')
         
         # Compliance Score Circle (visual)
         pdf.ln(20)
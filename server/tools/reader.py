@@ -1,5 +1,12 @@
-from typing import Optional
+import io
+import os
+import codecs
+import asyncio
+import multiprocessing
+from collections import deque
+from typing import Optional, List, Tuple, Union, Iterator, AsyncIterator
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
 
 try:
     from pypdf import PdfReader
@@ -8,10 +15,144 @@ except ImportError:
     PDF_AVAILABLE = False
 
 
+def _open_pdf(source: Union[bytes, str]) -> "PdfReader":
+    return PdfReader(io.BytesIO(source) if isinstance(source, bytes) else source)
+
+
+def _extract_pages(source: Union[bytes, str], start: int = 0, stop: int = None) -> List[Tuple[int, str]]:
+    """
+    Extract (page_number, text) for non-empty pages in pages[start:stop].
+    source is PDF bytes or a file path. Runs in worker processes.
+    """
+    reader = _open_pdf(source)
+    text_parts = []
+    for number, page in enumerate(reader.pages[start:stop], start=start + 1):
+        text = page.extract_text()
+        if text:
+            text_parts.append((number, text))
+    return text_parts
+
+
 class DocumentReader:
     """
     Tool for reading PDF and text documents.
+    PDF text extraction runs in a process pool, fanning large documents out by page range.
     """
+    def __init__(self, max_workers: int = None, pages_per_task: int = None):
+        # PDF_WORKERS=0 extracts in-process
+        self.max_workers = max_workers if max_workers is not None else int(os.getenv("PDF_WORKERS", str(os.cpu_count() or 1)))
+        self.pages_per_task = pages_per_task or int(os.getenv("PDF_PAGES_PER_TASK", "25"))
+        self.text_block_size = int(os.getenv("TEXT_BLOCK_CHARS", "65536"))
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def _get_pool(self) -> Optional[ProcessPoolExecutor]:
+        if self.max_workers <= 0:
+            return None
+        if self._pool is None:
+            # spawn, not fork: the server is multi-threaded by the time the pool starts
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._pool
+
+    def close(self):
+        """Shut down the extraction process pool."""
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+    def _page_ranges(self, source: Union[bytes, str]) -> List[tuple]:
+        page_count = len(_open_pdf(source).pages)
+        return [(start, min(start + self.pages_per_task, page_count))
+                for start in range(0, page_count, self.pages_per_task)] or [(0, 0)]
+
+    def extract_pdf_bytes(self, content: bytes) -> str:
+        """
+        Extract text from PDF bytes, fanning page ranges out across the process pool.
+        Output is identical to sequential page-by-page extraction.
+        """
+        if not PDF_AVAILABLE:
+            raise ImportError("pypdf is not installed. Run: pip install pypdf")
+        pool = self._get_pool()
+        if pool is None:
+            return "\n\n".join(text for _, text in _extract_pages(content))
+        futures = [pool.submit(_extract_pages, content, start, stop) for start, stop in self._page_ranges(content)]
+        return "\n\n".join(text for future in futures for _, text in future.result())
+
+    @staticmethod
+    def page_separator(filename: str) -> str:
+        """Separator placed between iter_pages items when the full text is assembled."""
+        return "\n\n" if filename.lower().endswith(".pdf") else ""
+
+    def iter_pages(self, file_path: str, filename: str = None) -> Iterator[Tuple[int, str]]:
+        """
+        Yield (page_number, text) from a file on disk without loading it whole.
+        Text files are yielded in line-aligned blocks, all numbered page 1.
+        Joining the texts with page_separator() reproduces read_bytes().
+        """
+        filename = filename or file_path
+        if filename.lower().endswith(".pdf"):
+            if not PDF_AVAILABLE:
+                raise ImportError("pypdf is not installed. Run: pip install pypdf")
+            reader = PdfReader(file_path)
+            for number, page in enumerate(reader.pages, start=1):
+                text = page.extract_text()
+                if text:
+                    yield number, text
+            return
+
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+        carry = ""
+        with open(file_path, "rb") as f:
+            while True:
+                block = f.read(self.text_block_size)
+                text = carry + decoder.decode(block, final=not block)
+                if not block:
+                    if text:
+                        yield 1, text
+                    return
+                cut = text.rfind("\n") + 1
+                if cut:
+                    yield 1, text[:cut]
+                    carry = text[cut:]
+                else:
+                    carry = text
+
+    async def iter_pages_async(self, file_path: str, filename: str = None) -> AsyncIterator[Tuple[int, str]]:
+        """
+        Async variant of iter_pages. PDF page ranges are extracted in the process
+        pool a few at a time and yielded in order, keeping memory bounded.
+        """
+        filename = filename or file_path
+        pool = self._get_pool() if filename.lower().endswith(".pdf") else None
+        if pool is None:
+            pages = self.iter_pages(file_path, filename)
+            while True:
+                item = await asyncio.to_thread(next, pages, None)
+                if item is None:
+                    return
+                yield item
+
+        if not PDF_AVAILABLE:
+            raise ImportError("pypdf is not installed. Run: pip install pypdf")
+        loop = asyncio.get_running_loop()
+        ranges = iter(await asyncio.to_thread(self._page_ranges, file_path))
+        in_flight = deque()
+        try:
+            for start, stop in ranges:
+                in_flight.append(loop.run_in_executor(pool, _extract_pages, file_path, start, stop))
+                if len(in_flight) >= self.max_workers:
+                    break
+            while in_flight:
+                pages = await in_flight.popleft()
+                next_range = next(ranges, None)
+                if next_range:
+                    in_flight.append(loop.run_in_executor(pool, _extract_pages, file_path, *next_range))
+                for item in pages:
+                    yield item
+        finally:
+            for future in in_flight:
+                future.cancel()
     
     def read_pdf(self, file_path: str) -> str:
         """
@@ -46,17 +187,7 @@ class DocumentReader:
         Read document from bytes (for file uploads).
         """
         if filename.lower().endswith(".pdf"):
-            if not PDF_AVAILABLE:
-                raise ImportError("pypdf is not installed. Run: pip install pypdf")
-            
-            import io
-            reader = PdfReader(io.BytesIO(content))
-            text_parts = []
-            for page in reader.pages:
-                text = page.extract_text()
-                if text:
-                    text_parts.append(text)
-            return "\n\n".join(text_parts)
+            return self.extract_pdf_bytes(content)
         else:
             # Assume text file
             return content.decode("utf-8", errors="ignore")
@@ -0,0 +1,132 @@
+import os
+import re
+import json
+import time
+import hashlib
+import tempfile
+from datetime import datetime
+from typing import Callable, Dict, Any, Optional
+
+# Bump when the report layout changes so cached PDFs are not reused across templates
+RENDER_VERSION = "2"
+
+# Only files named by filename_for are cache entries; anything else in the reports
+# directory (e.g. older timestamped reports) is archive and never evicted
+CACHE_FILENAME = re.compile(r"compliance_report_\d{8}_[0-9a-f]{20}\.pdf")
+
+
+def _normalize(value):
+    if isinstance(value, str):
+        return " ".join(value.split())
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
+
+
+class ReportCache:
+    """
+    Content-addressed store for rendered PDF reports.
+    The filename is derived from a hash of the normalized report inputs (plus the day,
+    since reports print their date), so identical requests reuse one file and distinct
+    reports never collide. The directory is also the report archive, so eviction is off
+    unless REPORT_CACHE_MAX_AGE_SECONDS / REPORT_CACHE_MAX_BYTES are set, and then only
+    touches files this cache named.
+    Lookups are a single os.path.exists, so renderers in worker processes share it.
+    """
+    def __init__(self, directory: str, max_age_seconds: float = None, max_bytes: int = None,
+                 sweep_interval: float = None):
+        self.directory = directory
+        # 0 disables the limit
+        self.max_age_seconds = max_age_seconds if max_age_seconds is not None else float(os.getenv("REPORT_CACHE_MAX_AGE_SECONDS", "0"))
+        self.max_bytes = max_bytes if max_bytes is not None else int(os.getenv("REPORT_CACHE_MAX_BYTES", "0"))
+        self.sweep_interval = sweep_interval if sweep_interval is not None else float(os.getenv("REPORT_CACHE_SWEEP_SECONDS", "300"))
+        self.on_evict: Optional[Callable[[str], None]] = None
+        self._last_sweep = 0.0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(findings: list, company_name: str, title: str, compliance_score, day: str) -> str:
+        payload = _normalize({
+            "version": RENDER_VERSION,
+            "findings": findings,
+            "company": company_name,
+            "title": title,
+            "score": compliance_score,
+            "day": day
+        })
+        canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def filename_for(self, findings: list, company_name: str, title: str, compliance_score) -> str:
+        day = datetime.now().strftime("%Y%m%d")
+        key = self.make_key(findings, company_name, title, compliance_score, day)
+        return f"compliance_report_{day}_{key[:20]}.pdf"
+
+    def lookup(self, filename: str) -> bool:
+        """True if an identical report has already been rendered."""
+        if os.path.exists(os.path.join(self.directory, filename)):
+            self.hits += 1
+            return True
+        self.misses += 1
+        return False
+
+    def write(self, filename: str, render: Callable[[str], None]):
+        """render(path) writes the PDF to a temp file that is then renamed into place."""
+        fd, tmp_path = tempfile.mkstemp(suffix=".pdf.tmp", dir=self.directory)
+        os.close(fd)
+        try:
+            render(tmp_path)
+            os.replace(tmp_path, os.path.join(self.directory, filename))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def sweep(self, force: bool = False):
+        """Delete cached reports older than max_age, then the oldest until under the disk budget."""
+        if not self.max_age_seconds and not self.max_bytes:
+            return
+        now = time.time()
+        if not force and now - self._last_sweep < self.sweep_interval:
+            return
+        self._last_sweep = now
+
+        files = []
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if entry.is_file() and CACHE_FILENAME.fullmatch(entry.name):
+                    stat = entry.stat()
+                    files.append((stat.st_mtime, stat.st_size, entry.name))
+        files.sort()
+
+        total = sum(size for _, size, _ in files)
+        for mtime, size, name in files:
+            expired = self.max_age_seconds and now - mtime > self.max_age_seconds
+            if not expired and (not self.max_bytes or total <= self.max_bytes):
+                break
+            self._evict(name)
+            total -= size
+
+    def _evict(self, name: str):
+        try:
+            os.remove(os.path.join(self.directory, name))
+        except FileNotFoundError:
+            return
+        self.evictions += 1
+        if self.on_evict is not None:
+            self.on_evict(name)
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "max_age_seconds": self.max_age_seconds,
+            "max_bytes": self.max_bytes
+        }
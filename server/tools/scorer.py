@@ -1,40 +1,106 @@
-from typing import Dict
+import os
+import json
+from typing import Dict, List, Any, Iterable, Optional
+
+LEVELS = ("Low", "Medium", "High", "Critical")
+RANK = {level: rank for rank, level in enumerate(LEVELS)}
+
+# Rules table: any keyword (case-insensitive substring) raises impact and/or likelihood
+# to the given level. The highest matching level wins. Override with RISK_RULES_FILE
+# (a JSON list in the same shape).
+DEFAULT_RULES = [
+    {"keywords": ["data retention", "encryption"], "impact": "High"},
+    {"keywords": ["pii", "pan"], "impact": "Critical"},
+    {"keywords": ["missing"], "likelihood": "High"},
+]
+
+
+def severity_for(impact: str, likelihood: str) -> str:
+    """Risk matrix: impact x likelihood -> severity."""
+    if impact == "Critical":
+        return "Critical"
+    if impact == "High" and likelihood == "High":
+        return "High"
+    if impact == "High":
+        return "Medium"
+    return "Low"
+
+
+def load_rules(path: Optional[str] = None) -> List[Dict[str, Any]]:
+    path = path or os.getenv("RISK_RULES_FILE")
+    if not path:
+        return DEFAULT_RULES
+    with open(path, encoding="utf-8") as f:
+        rules = json.load(f)
+    print(f"[Tool:RiskScorer] Loaded {len(rules)} scoring rules from {path}")
+    return rules
+
 
 class RiskScorer:
     """
     Tier 1 Tool: Risk Scoring Engine
     Calculates severity of a finding based on Impact and Likelihood.
+    The rules table is compiled once into, per dimension, keyword tuples ordered from the
+    highest level down, so scoring stops at the first (highest) level that matches.
     """
+    def __init__(self, rules: Optional[Iterable[Dict[str, Any]]] = None):
+        self.rules = list(rules) if rules is not None else load_rules()
+        self._compile()
+
+    def _compile(self):
+        buckets = {"impact": {}, "likelihood": {}}  # field -> rank -> keywords
+        for rule in self.rules:
+            for field, by_rank in buckets.items():
+                if field not in rule:
+                    continue
+                if rule[field] not in RANK:
+                    raise ValueError(f"Unknown {field} level '{rule[field]}' in risk rule {rule}")
+                keywords = by_rank.setdefault(RANK[rule[field]], [])
+                keywords.extend(k.lower() for k in rule["keywords"] if k.lower() not in keywords)
+        # [(rank, (keyword, ...)), ...] highest rank first; Low needs no check
+        self._impact = [(rank, tuple(kw)) for rank, kw in sorted(buckets["impact"].items(), reverse=True) if rank]
+        self._likelihood = [(rank, tuple(kw)) for rank, kw in sorted(buckets["likelihood"].items(), reverse=True) if rank]
+
+    @staticmethod
+    def _level(text_lower: str, table) -> str:
+        for rank, keywords in table:
+            for keyword in keywords:
+                if keyword in text_lower:
+                    return LEVELS[rank]
+        return LEVELS[0]
+
     def calculate_score(self, finding_text: str) -> Dict[str, str]:
-        print(f"[Tool:RiskScorer] Calculating risk matrix for finding...")
-        
-        impact = "Low"
-        likelihood = "Low"
-        score = "Low"
-        
         text_lower = finding_text.lower()
-        
-        # Heuristic scoring
-        if "data retention" in text_lower or "encryption" in text_lower:
-            impact = "High"
-        if "pii" in text_lower or "pan" in text_lower:
-            impact = "Critical"
-            
-        if "missing" in text_lower:
-            likelihood = "High"
-            
-        # Matrix Logic
-        if impact == "Critical":
-            score = "Critical"
-        elif impact == "High" and likelihood == "High":
-            score = "High"
-        elif impact == "High":
-            score = "Medium"
-        else:
-            score = "Low"
-            
+        impact = self._level(text_lower, self._impact)
+        likelihood = self._level(text_lower, self._likelihood)
         return {
             "impact": impact,
             "likelihood": likelihood,
-            "severity": score
+            "severity": severity_for(impact, likelihood)
+        }
+
+    def score_batch(self, findings: Iterable[str]) -> Dict[str, Any]:
+        """
+        Score many findings in one pass (identical texts are scored once).
+        Returns the per-finding risk matrices in input order plus impact x likelihood
+        and severity counts for the whole batch.
+        """
+        memo: Dict[str, Dict[str, str]] = {}
+        results = []
+        grid = [[0] * len(LEVELS) for _ in LEVELS]  # grid[impact][likelihood]
+        by_severity = dict.fromkeys(LEVELS, 0)
+        for text in findings:
+            result = memo.get(text)
+            if result is None:
+                result = memo[text] = self.calculate_score(text)
+            results.append(result)
+            grid[RANK[result["impact"]]][RANK[result["likelihood"]]] += 1
+            by_severity[result["severity"]] += 1
+        print(f"[Tool:RiskScorer] Scored {len(results)} findings ({len(memo)} distinct)")
+        return {
+            "results": results,
+            "count": len(results),
+            "levels": list(LEVELS),
+            "matrix": grid,
+            "by_severity": by_severity
         }